@@ -4,6 +4,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from .database import init_db
 from .routers import alerts, detections, ingest
@@ -33,6 +34,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (alert lists, evidence) for clients sending Accept-Encoding: gzip.
+# Raise the threshold, or drop the middleware, for internal traffic where CPU matters more.
+GZIP_MINIMUM_SIZE = 1024
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
 # Include routers
 app.include_router(ingest.router, prefix="/api/v1", tags=["Ingestion"])
 app.include_router(detections.router, prefix="/api/v1", tags=["Detections"])
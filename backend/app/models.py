@@ -2,7 +2,8 @@
 
 from enum import Enum
 
-from sqlalchemy import JSON, Column, DateTime, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text, and_, column, text
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
 from .database import Base
@@ -26,10 +27,52 @@ class AlertSeverity(str, Enum):  # noqa: UP042
     CRITICAL = "critical"
 
 
+# Canonical login action; normalize_event maps login/signin/authenticate to it
+LOGIN_ACTION = "user.login"
+
+# Partial-index predicates matching detection rule filters
+_LOGIN = column("action") == LOGIN_ACTION
+_FAILED_LOGIN = and_(_LOGIN, column("outcome") == "failure")
+_HAS_USER_AGENT = text("user_agent IS NOT NULL")
+
+
 class Event(Base):
     """Canonical event schema for all ingested security events."""
 
     __tablename__ = "events"
+    __table_args__ = (
+        # Per-user login timelines (impossible travel): rows come back pre-sorted
+        Index("ix_events_actor_timestamp", "actor", "timestamp"),
+        # Partial indexes holding only the rows the login rules scan
+        Index(
+            "ix_events_failed_login",
+            "timestamp",
+            "source_ip",
+            sqlite_where=_FAILED_LOGIN,
+            postgresql_where=_FAILED_LOGIN,
+        ),
+        Index(
+            "ix_events_login",
+            "timestamp",
+            "source_ip",
+            sqlite_where=_LOGIN,
+            postgresql_where=_LOGIN,
+        ),
+        # Window scans over events that carry a user agent (suspicious UA rule).
+        # SQLite covers user_agent too; PostgreSQL keeps the key to timestamp
+        # since long user agents can exceed its btree entry size limit
+        Index(
+            "ix_events_timestamp_user_agent",
+            "timestamp",
+            "user_agent",
+            sqlite_where=_HAS_USER_AGENT,
+        ).ddl_if(dialect="sqlite"),
+        Index(
+            "ix_events_timestamp_has_user_agent",
+            "timestamp",
+            postgresql_where=_HAS_USER_AGENT,
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(DateTime, nullable=False, index=True)
@@ -40,7 +83,8 @@ class Event(Base):
     resource = Column(String(512), nullable=True)
     outcome = Column(String(50), nullable=True, index=True)  # success, failure, error
     request_id = Column(String(255), nullable=True, index=True)
-    raw_data = Column(JSON, nullable=True)  # Store original event for forensics
+    # Store original event for forensics; deferred so rule scans don't decode it
+    raw_data = deferred(Column(JSON, nullable=True))
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
 
 
@@ -48,6 +92,16 @@ class Alert(Base):
     """Security alert generated by detection rules."""
 
     __tablename__ = "alerts"
+    __table_args__ = (
+        # Deduplication lookups: same rule within a recent time window
+        Index("ix_alerts_rule_id_alert_time", "rule_id", "alert_time"),
+        Index(
+            "ix_alerts_rule_id_fingerprint_alert_time",
+            "rule_id",
+            "evidence_fingerprint",
+            "alert_time",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     rule_id = Column(String(100), nullable=False, index=True)
@@ -55,6 +109,7 @@ class Alert(Base):
     status = Column(String(20), nullable=False, default=AlertStatus.OPEN.value, index=True)
     summary = Column(Text, nullable=False)
     evidence = Column(JSON, nullable=False)  # Stores event IDs, counts, time windows
+    evidence_fingerprint = Column(String(32), nullable=True)  # blake2b of canonical evidence
     alert_time = Column(DateTime, nullable=False, index=True)
     window_start = Column(DateTime, nullable=True)
     window_end = Column(DateTime, nullable=True)
@@ -66,6 +121,10 @@ class AllowlistEntry(Base):
     """IP or actor allowlist for suppressing false positives."""
 
     __tablename__ = "allowlist"
+    __table_args__ = (
+        # Allowlist lookups match on type and value together
+        Index("ix_allowlist_entry_type_entry_value", "entry_type", "entry_value"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     entry_type = Column(String(20), nullable=False, index=True)  # 'ip' or 'actor'
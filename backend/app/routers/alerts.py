@@ -6,14 +6,15 @@ from datetime import datetime, timezone
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, delete, or_, select
 from sqlalchemy.orm import Session
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models import Alert, AllowlistEntry, FalsePositive
 from ..schemas import (
     AlertResponse,
     AlertStatusUpdate,
+    AlertSummaryResponse,
     AllowlistCreate,
     AllowlistResponse,
     FalsePositiveCreate,
@@ -21,14 +22,17 @@ from ..schemas import (
 
 router = APIRouter()
 
+# Columns needed for the alert list view (evidence is only loaded for details)
+ALERT_SUMMARY_COLUMNS = [getattr(Alert, name) for name in AlertSummaryResponse.model_fields]
 
-@router.get("/alerts", response_model=List[AlertResponse])
+
+@router.get("/alerts", response_model=List[AlertSummaryResponse])
 async def list_alerts(
     status: Optional[str] = Query(None, description="Filter by status"),
     severity: Optional[str] = Query(None, description="Filter by severity"),
     rule_id: Optional[str] = Query(None, description="Filter by rule ID"),
     limit: int = Query(50, le=500, description="Maximum number of alerts to return"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     List alerts with optional filters.
@@ -39,9 +43,10 @@ async def list_alerts(
     - rule_id: specific detection rule
     - limit: max results (default 50, max 500)
 
-    Returns alerts ordered by most recent first.
+    Returns alerts ordered by most recent first, without evidence.
+    Use GET /alerts/{alert_id} for the full alert.
     """
-    query = db.query(Alert)
+    stmt = select(*ALERT_SUMMARY_COLUMNS)
 
     # Apply filters
     filters = []
@@ -53,19 +58,16 @@ async def list_alerts(
         filters.append(Alert.rule_id == rule_id)
 
     if filters:
-        query = query.filter(and_(*filters))
-
-    # Order by most recent
-    query = query.order_by(Alert.alert_time.desc())
+        stmt = stmt.where(and_(*filters))
 
-    # Limit results
-    alerts = query.limit(limit).all()
+    # Most recent first, limited
+    stmt = stmt.order_by(Alert.alert_time.desc()).limit(limit)
 
-    return alerts
+    return db.execute(stmt).all()
 
 
 @router.get("/alerts/{alert_id}", response_model=AlertResponse)
-async def get_alert(alert_id: int, db: Session = Depends(get_db)):
+async def get_alert(alert_id: int, db: Session = Depends(get_read_db)):
     """Get detailed information about a specific alert."""
     alert = db.query(Alert).filter(Alert.id == alert_id).first()
 
@@ -140,7 +142,7 @@ async def mark_false_positive(
 
 
 @router.get("/allowlist", response_model=List[AllowlistResponse])
-async def list_allowlist(db: Session = Depends(get_db)):
+async def list_allowlist(db: Session = Depends(get_read_db)):
     """List all active allowlist entries."""
     now = datetime.now(timezone.utc)
 
@@ -188,12 +190,13 @@ async def add_to_allowlist(
 @router.delete("/allowlist/{entry_id}")
 async def remove_from_allowlist(entry_id: int, db: Session = Depends(get_db)):
     """Remove entry from allowlist."""
-    entry = db.query(AllowlistEntry).filter(AllowlistEntry.id == entry_id).first()
+    # Delete directly; the affected row count doubles as the existence check
+    result = db.execute(delete(AllowlistEntry).where(AllowlistEntry.id == entry_id))
 
-    if not entry:
+    if result.rowcount == 0:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Allowlist entry not found")
 
-    db.delete(entry)
     db.commit()
 
     return {"status": "success", "message": "Entry removed from allowlist"}
@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+import uuid
+from collections import OrderedDict
+from typing import Dict
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from ..database import get_db
-from ..schemas import DetectionRunResponse
+from ..database import SessionLocal, get_db
+from ..schemas import DetectionRunResponse, DetectionRunStatus
 from ..services.detection_engine import run_detections
 
 router = APIRouter()
 
+# Recent background runs, oldest first (in-memory; lost on restart)
+MAX_TRACKED_RUNS = 100
+_runs: OrderedDict[str, Dict] = OrderedDict()
+
 
 @router.post("/detections/run", response_model=DetectionRunResponse)
 async def trigger_detection_run(db: Session = Depends(get_db)):
@@ -19,9 +28,59 @@ async def trigger_detection_run(db: Session = Depends(get_db)):
 
     In production, this runs automatically on a schedule.
     This endpoint allows manual execution for testing and demos.
+    Rules execute in a worker thread so the event loop keeps serving
+    other requests while the run is in progress.
 
     Returns:
         DetectionRunResponse with alerts generated and execution stats
     """
-    result = run_detections(db)
+    result = await run_in_threadpool(run_detections, db)
     return result
+
+
+@router.post("/detections/run/async", response_model=DetectionRunStatus, status_code=202)
+async def trigger_background_detection_run(background_tasks: BackgroundTasks):
+    """
+    Queue a detection run and return immediately.
+
+    Poll GET /detections/runs/{run_id} for the outcome.
+
+    Returns:
+        DetectionRunStatus with the run ID and queued status
+    """
+    run_id = uuid.uuid4().hex
+    _runs[run_id] = {"run_id": run_id, "status": "queued"}
+    while len(_runs) > MAX_TRACKED_RUNS:
+        _runs.popitem(last=False)
+
+    background_tasks.add_task(_execute_run, run_id)
+    return _runs[run_id]
+
+
+@router.get("/detections/runs/{run_id}", response_model=DetectionRunStatus)
+async def get_detection_run(run_id: str):
+    """Get the status and result of a background detection run."""
+    run = _runs.get(run_id)
+
+    if not run:
+        raise HTTPException(status_code=404, detail="Detection run not found")
+
+    return run
+
+
+def _execute_run(run_id: str) -> None:
+    """Run detections for a queued run with its own database session."""
+    run = _runs.get(run_id)
+    if run is None:
+        return
+
+    run["status"] = "running"
+    db = SessionLocal()
+    try:
+        run["result"] = run_detections(db)
+        run["status"] = "completed"
+    except Exception as e:
+        run["status"] = "failed"
+        run["error"] = str(e)
+    finally:
+        db.close()
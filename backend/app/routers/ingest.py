@@ -2,18 +2,28 @@
 
 from __future__ import annotations
 
-from typing import List, Union
+from typing import Any, Dict, List, Union
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from ..database import get_db
 from ..models import Event
 from ..schemas import EventCreate, IngestResponse
-from ..services.normalizer import normalize_event
+from ..services.normalizer import normalize_event, normalize_events
 
 router = APIRouter()
 
+# Number of parsed NDJSON events buffered before each bulk insert
+NDJSON_BATCH_SIZE = 500
+
+# Validator for JSON array bodies, built once at import
+_EVENT_LIST_ADAPTER = TypeAdapter(List[EventCreate])
+
 
 @router.post("/ingest", response_model=IngestResponse)
 async def ingest_events(
@@ -26,7 +36,8 @@ async def ingest_events(
     Accepts:
     - Single event: JSON object
     - Batch events: JSON array
-    - NDJSON: newline-delimited JSON (handled by parsing as array)
+
+    For newline-delimited JSON, use POST /ingest/ndjson.
 
     Returns:
         IngestResponse with ingested count and event IDs
@@ -35,30 +46,107 @@ async def ingest_events(
     if not isinstance(events, list):
         events = [events]
 
+    return _store_events(db, events)
+
+
+@router.post("/ingest/batch", response_model=IngestResponse)
+async def ingest_batch(request: Request, db: Session = Depends(get_db)):
+    """
+    Ingest a JSON array of events.
+
+    The raw body is validated in a single pass by a cached TypeAdapter,
+    skipping the single-or-list union resolution done by POST /ingest.
+
+    Returns:
+        IngestResponse with ingested count and event IDs
+    """
+    body = await request.body()
+
+    try:
+        events = _EVENT_LIST_ADAPTER.validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+    return _store_events(db, events)
+
+
+@router.post("/ingest/ndjson", response_model=IngestResponse)
+async def ingest_ndjson(request: Request, db: Session = Depends(get_db)):
+    """
+    Ingest newline-delimited JSON (one event object per line).
+
+    The request body is streamed and parsed line by line, and events are
+    written in batches of NDJSON_BATCH_SIZE, so large payloads are never
+    held in memory as a whole. Blank lines are ignored; invalid lines are
+    reported in `errors` without aborting the rest of the upload.
+
+    Returns:
+        IngestResponse with ingested count and event IDs
+    """
     event_ids = []
     errors = []
-
-    for idx, event_data in enumerate(events):
+    batch = []
+    buffer = b""
+    line_no = 0
+
+    def handle_line(line: bytes) -> None:
+        line = line.strip()
+        if not line:
+            return
         try:
-            # Convert Pydantic model to dict
-            raw_event = event_data.model_dump(by_alias=True)
+            event_data = EventCreate.model_validate(orjson.loads(line))
+            batch.append(normalize_event(event_data.model_dump(by_alias=True)))
+        except Exception as e:
+            errors.append(f"Line {line_no}: {str(e)}")
 
-            # Normalize event
-            normalized = normalize_event(raw_event)
+    try:
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                line_no += 1
+                handle_line(line)
+            if len(batch) >= NDJSON_BATCH_SIZE:
+                event_ids.extend(_insert_events(db, batch))
+                batch.clear()
+
+        # Trailing line without a newline terminator
+        line_no += 1
+        handle_line(buffer)
+
+        event_ids.extend(_insert_events(db, batch))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-            # Create database model
-            event = Event(**normalized)
-            db.add(event)
-            db.flush()  # Get ID without committing
+    return IngestResponse(
+        ingested=len(event_ids),
+        event_ids=event_ids,
+        errors=errors,
+    )
 
-            event_ids.append(event.id)
 
-        except Exception as e:
-            errors.append(f"Event {idx}: {str(e)}")
-            continue
+def _store_events(db: Session, events: List[EventCreate]) -> IngestResponse:
+    """Normalize validated events, insert them in one statement, and commit."""
+    # Convert Pydantic models to dicts
+    raw_events = [event_data.model_dump(by_alias=True) for event_data in events]
+    errors = []
 
-    # Commit all events
     try:
+        rows = normalize_events(raw_events)
+    except Exception:
+        # Re-run event by event to report every failing event and keep the rest
+        rows = []
+        for idx, raw_event in enumerate(raw_events):
+            try:
+                rows.append(normalize_event(raw_event))
+            except Exception as e:
+                errors.append(f"Event {idx}: {str(e)}")
+
+    # Insert all events in a single multi-row statement and commit
+    try:
+        event_ids = _insert_events(db, rows)
         db.commit()
     except Exception as e:
         db.rollback()
@@ -69,3 +157,12 @@ async def ingest_events(
         event_ids=event_ids,
         errors=errors,
     )
+
+
+def _insert_events(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """Insert normalized events in one executemany and return their IDs in order."""
+    if not rows:
+        return []
+
+    result = db.execute(insert(Event).returning(Event.id, sort_by_parameter_order=True), rows)
+    return list(result.scalars())
@@ -5,6 +5,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from dateutil import parser
 from pydantic import BaseModel, Field, field_validator
 
 from .models import AlertStatus
@@ -35,7 +36,13 @@ class EventCreate(BaseModel):
             # Unix timestamp
             return datetime.fromtimestamp(v, tz=timezone.utc)
         if isinstance(v, str):
-            from dateutil import parser
+            # Fast path: ISO8601 via the C parser (older Pythons reject a "Z" suffix)
+            try:
+                if v.endswith(("Z", "z")):
+                    return datetime.fromisoformat(v[:-1] + "+00:00")
+                return datetime.fromisoformat(v)
+            except ValueError:
+                pass
 
             return parser.parse(v)
         return v
@@ -58,15 +65,14 @@ class EventResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
-class AlertResponse(BaseModel):
-    """Schema for alert response."""
+class AlertSummaryResponse(BaseModel):
+    """Schema for alert list response (evidence omitted)."""
 
     id: int
     rule_id: str
     severity: str
     status: str
     summary: str
-    evidence: Dict[str, Any]
     alert_time: datetime
     window_start: Optional[datetime]
     window_end: Optional[datetime]
@@ -76,6 +82,12 @@ class AlertResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class AlertResponse(AlertSummaryResponse):
+    """Schema for alert response."""
+
+    evidence: Dict[str, Any]
+
+
 class AlertStatusUpdate(BaseModel):
     """Schema for updating alert status."""
 
@@ -129,3 +141,12 @@ class DetectionRunResponse(BaseModel):
     alerts_generated: int
     rules_executed: List[str]
     execution_time_ms: float
+
+
+class DetectionRunStatus(BaseModel):
+    """Schema for a background detection run."""
+
+    run_id: str
+    status: str  # queued, running, completed, failed
+    result: Optional[DetectionRunResponse] = None
+    error: Optional[str] = None
@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+import hashlib
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
+import orjson
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import SingletonThreadPool, StaticPool
 
 from ..models import Alert, AlertStatus, AllowlistEntry
 from .rules.api_abuse import ApiAbuseRule
+from .rules.base import DetectionRule
 from .rules.brute_force import BruteForceRule
 from .rules.impossible_travel import ImpossibleTravelRule
 from .rules.password_spray import PasswordSprayRule
@@ -38,149 +44,190 @@ def run_detections(db: Session) -> dict:
         Dictionary with execution statistics
     """
     start_time = time.time()
-    alerts_generated = 0
     rules_executed = []
+    alerts_to_insert = []
 
-    for rule in DETECTION_RULES:
-        try:
-            # Calculate time window for this rule
-            window_end = datetime.now(timezone.utc)
-            window_start = window_end - timedelta(minutes=rule.window_minutes)
+    # Load active allowlist entries and recent alert fingerprints once for the whole run
+    allowlist = _load_allowlist(db)
+    recent_fingerprints = _load_recent_fingerprints(db)
+
+    # Rules query independently, so run them concurrently on their own sessions
+    rule_results = _execute_rules(db)
 
-            # Execute detection
-            detections = rule.detect(db, window_start, window_end)
+    for rule, (detections, error) in zip(DETECTION_RULES, rule_results):
+        if error is not None:
+            # Log error but continue with other rules
+            print(f"Error executing rule {rule.rule_id}: {str(error)}")
+            continue
 
-            # Create alerts
+        try:
+            # Build this rule's alerts; a failure here only drops this rule
+            rule_alerts = []
+            new_fingerprints = set()
             for detection in detections:
                 # Check if alert should be suppressed by allowlist
-                if _is_allowlisted(db, detection):
+                if _is_allowlisted(allowlist, detection):
                     continue
 
-                # Check for duplicate alerts (same rule + similar evidence in recent window)
-                if _is_duplicate(db, detection):
+                # Check for duplicate alerts (same rule + same evidence in recent window)
+                key = (detection["rule_id"], _fingerprint_evidence(detection["evidence"]))
+                if key in recent_fingerprints or key in new_fingerprints:
                     continue
 
-                # Create alert
-                alert = Alert(
-                    rule_id=detection["rule_id"],
-                    severity=detection["severity"],
-                    status=AlertStatus.OPEN.value,
-                    summary=detection["summary"],
-                    evidence=detection["evidence"],
-                    alert_time=detection["alert_time"],
-                    window_start=detection.get("window_start"),
-                    window_end=detection.get("window_end"),
+                rule_alerts.append(
+                    {
+                        "rule_id": detection["rule_id"],
+                        "severity": detection["severity"],
+                        "status": AlertStatus.OPEN.value,
+                        "summary": detection["summary"],
+                        "evidence": detection["evidence"],
+                        "evidence_fingerprint": key[1],
+                        "alert_time": detection["alert_time"],
+                        "window_start": detection.get("window_start"),
+                        "window_end": detection.get("window_end"),
+                    }
                 )
-                db.add(alert)
-                alerts_generated += 1
-
-            db.commit()
-            rules_executed.append(rule.rule_id)
+                new_fingerprints.add(key)
 
         except Exception as e:
             # Log error but continue with other rules
             print(f"Error executing rule {rule.rule_id}: {str(e)}")
-            db.rollback()
             continue
 
+        alerts_to_insert.extend(rule_alerts)
+        recent_fingerprints |= new_fingerprints
+        rules_executed.append(rule.rule_id)
+
+    # Insert all alerts from the run in one statement and one transaction
+    if alerts_to_insert:
+        try:
+            db.execute(insert(Alert), alerts_to_insert)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
     execution_time = (time.time() - start_time) * 1000  # milliseconds
 
     return {
-        "alerts_generated": alerts_generated,
+        "alerts_generated": len(alerts_to_insert),
         "rules_executed": rules_executed,
         "execution_time_ms": round(execution_time, 2),
     }
 
 
-def _is_allowlisted(db: Session, detection: dict) -> bool:
+def _execute_rules(db: Session) -> List[Tuple[List[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Run every rule's detect() and return (detections, error) in registry order.
+
+    Each rule gets its own session since sessions are not thread-safe. Pools
+    that pin a single connection (e.g. in-memory SQLite) cannot serve
+    concurrent sessions, so those binds run the rules sequentially on `db`.
+    """
+    bind = db.get_bind()
+
+    if isinstance(bind.pool, (SingletonThreadPool, StaticPool)):
+        return [_execute_rule(rule, db) for rule in DETECTION_RULES]
+
+    session_factory = sessionmaker(bind=bind, autoflush=False)
+
+    def run_isolated(rule: DetectionRule):
+        rule_db = session_factory()
+        try:
+            return _execute_rule(rule, rule_db)
+        finally:
+            rule_db.close()
+
+    with ThreadPoolExecutor(max_workers=len(DETECTION_RULES)) as executor:
+        return list(executor.map(run_isolated, DETECTION_RULES))
+
+
+def _execute_rule(
+    rule: DetectionRule, db: Session
+) -> Tuple[List[Dict[str, Any]], Optional[Exception]]:
+    """Run a single rule over its time window, capturing any error."""
+    try:
+        # Calculate time window for this rule
+        window_end = datetime.now(timezone.utc)
+        window_start = window_end - timedelta(minutes=rule.window_minutes)
+
+        # Execute detection
+        return rule.detect(db, window_start, window_end), None
+    except Exception as e:
+        db.rollback()
+        return [], e
+
+
+def _load_allowlist(db: Session) -> Set[Tuple[str, str, Optional[str]]]:
+    """Load non-expired allowlist entries as (entry_type, entry_value, rule_id) keys."""
+    now = datetime.now(timezone.utc)
+
+    entries = (
+        db.query(AllowlistEntry.entry_type, AllowlistEntry.entry_value, AllowlistEntry.rule_id)
+        .filter(or_(AllowlistEntry.expires_at.is_(None), AllowlistEntry.expires_at > now))
+        .all()
+    )
+
+    return {(entry.entry_type, entry.entry_value, entry.rule_id) for entry in entries}
+
+
+def _is_allowlisted(allowlist: Set[Tuple[str, str, Optional[str]]], detection: dict) -> bool:
     """Check if detection should be suppressed by allowlist."""
     evidence = detection.get("evidence", {})
     rule_id = detection["rule_id"]
 
     # Extract potential allowlist targets from evidence
-    source_ip = evidence.get("source_ip")
-    actor = evidence.get("actor")
-
-    # Check allowlist
-    now = datetime.now(timezone.utc)
-
-    # Check IP allowlist
-    if source_ip:
-        ip_allowed = (
-            db.query(AllowlistEntry)
-            .filter(
-                and_(
-                    AllowlistEntry.entry_type == "ip",
-                    AllowlistEntry.entry_value == source_ip,
-                    or_(
-                        AllowlistEntry.rule_id.is_(None),
-                        AllowlistEntry.rule_id == rule_id,
-                    ),
-                    or_(
-                        AllowlistEntry.expires_at.is_(None),
-                        AllowlistEntry.expires_at > now,
-                    ),
-                )
-            )
-            .first()
-        )
-        if ip_allowed:
-            return True
+    targets = (("ip", evidence.get("source_ip")), ("actor", evidence.get("actor")))
 
-    # Check actor allowlist
-    if actor:
-        actor_allowed = (
-            db.query(AllowlistEntry)
-            .filter(
-                and_(
-                    AllowlistEntry.entry_type == "actor",
-                    AllowlistEntry.entry_value == actor,
-                    or_(
-                        AllowlistEntry.rule_id.is_(None),
-                        AllowlistEntry.rule_id == rule_id,
-                    ),
-                    or_(
-                        AllowlistEntry.expires_at.is_(None),
-                        AllowlistEntry.expires_at > now,
-                    ),
-                )
-            )
-            .first()
-        )
-        if actor_allowed:
+    # Entries without a rule_id apply to every rule
+    for entry_type, value in targets:
+        if value and (
+            (entry_type, value, None) in allowlist or (entry_type, value, rule_id) in allowlist
+        ):
             return True
 
     return False
 
 
-def _is_duplicate(db: Session, detection: dict) -> bool:
-    """Check if similar alert was recently created."""
-    rule_id = detection["rule_id"]
-
-    # Look for recent alerts (last 1 hour) with same rule
+def _load_recent_fingerprints(db: Session) -> Set[Tuple[str, str]]:
+    """Load (rule_id, evidence_fingerprint) pairs for alerts in the dedup window."""
+    # Look for recent alerts (last 1 hour)
     recent_cutoff = datetime.now(timezone.utc) - timedelta(hours=1)
 
-    recent_alert = (
-        db.query(Alert)
-        .filter(
-            and_(
-                Alert.rule_id == rule_id,
-                Alert.alert_time >= recent_cutoff,
-            )
-        )
-        .first()
+    rows = (
+        db.query(Alert.rule_id, Alert.evidence_fingerprint)
+        .filter(Alert.alert_time >= recent_cutoff, Alert.evidence_fingerprint.isnot(None))
+        .distinct()
+        .all()
+    )
+    fingerprints = {(row.rule_id, row.evidence_fingerprint) for row in rows}
+
+    # Alerts created before the fingerprint column existed: hash their evidence here
+    legacy_rows = (
+        db.query(Alert.rule_id, Alert.evidence)
+        .filter(Alert.alert_time >= recent_cutoff, Alert.evidence_fingerprint.is_(None))
+        .all()
+    )
+    fingerprints.update(
+        (row.rule_id, _fingerprint_evidence(row.evidence)) for row in legacy_rows if row.evidence
     )
 
-    if recent_alert:
-        # Simple deduplication: if same rule triggered recently, suppress
-        # In production, compare evidence fingerprints
-        return True
+    return fingerprints
 
-    return False
 
+def _fingerprint_evidence(evidence: Dict[str, Any]) -> str:
+    """Hash canonicalized evidence so identical findings map to the same key."""
+    canonical = orjson.dumps(_canonicalize(evidence), option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
 
-def or_(*clauses):
-    """Helper for OR clauses in SQLAlchemy."""
-    from sqlalchemy import or_ as sqlalchemy_or
 
-    return sqlalchemy_or(*clauses)
+def _canonicalize(value: Any) -> Any:
+    """Sort list values recursively; SQL list aggregates come back in no fixed order."""
+    if isinstance(value, dict):
+        return {key: _canonicalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return sorted(
+            (_canonicalize(item) for item in value),
+            key=lambda item: orjson.dumps(item, option=orjson.OPT_SORT_KEYS),
+        )
+    return value
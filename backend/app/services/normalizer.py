@@ -2,12 +2,77 @@
 
 from __future__ import annotations
 
+import os
+import sys
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+import orjson
 from dateutil import parser
 
+# Field aliases checked in order by normalize_event; nested entries are (parent, child)
+_TIMESTAMP_KEYS = ("timestamp", "@timestamp", "time")
+_ACTOR_KEYS = ("actor", "user", "username")
+_ACTOR_NESTED = (("identity", "principalId"),)
+_SOURCE_IP_KEYS = ("source_ip", "sourceIP", "client_ip", "clientIP")
+_SOURCE_IP_NESTED = (("source", "ip"), ("network", "client_ip"))
+_USER_AGENT_KEYS = ("user_agent", "userAgent")
+_ACTION_KEYS = ("action", "event", "eventName")
+_RESOURCE_KEYS = ("resource", "target", "object")
+_RESOURCE_NESTED = (("requestParameters", "resource"),)
+_OUTCOME_KEYS = ("outcome", "result", "status")
+_OUTCOME_NESTED = (("responseElements", "status"),)
+_REQUEST_ID_KEYS = ("request_id", "requestId", "trace_id", "traceId")
+
+# Common log timestamp layouts not covered by datetime.fromisoformat on older Pythons
+_TIMESTAMP_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S.%f%z",  # 2024-02-09T20:00:00.1234Z
+    "%Y-%m-%dT%H:%M:%S%z",  # 2024-02-09T20:00:00Z (CloudTrail)
+    "%Y-%m-%d %H:%M:%S%z",  # 2024-02-09 20:00:00+0000
+    "%d/%b/%Y:%H:%M:%S %z",  # 09/Feb/2024:20:00:00 +0000 (access logs)
+)
+
+# Map common action patterns to canonical names (interned: every event shares one string)
+_ACTION_MAPPINGS = {
+    key: sys.intern(value)
+    for key, value in {
+        "login": "user.login",
+        "logout": "user.logout",
+        "signin": "user.login",
+        "signout": "user.logout",
+        "authenticate": "user.login",
+        "createuser": "iam.user.create",
+        "deleteuser": "iam.user.delete",
+        "updateuser": "iam.user.update",
+        "createrole": "iam.role.create",
+        "deleterole": "iam.role.delete",
+        "updaterole": "iam.role.update",
+        "attachrolepolicy": "iam.role.attach_policy",
+        "detachrolepolicy": "iam.role.detach_policy",
+        "putobject": "storage.object.create",
+        "getobject": "storage.object.read",
+        "deleteobject": "storage.object.delete",
+    }.items()
+}
+
+# Map common outcome values to success, failure, or error
+_OUTCOME_MAPPINGS = {
+    **dict.fromkeys(("success", "succeeded", "ok", "200", "201", "204"), "success"),
+    **dict.fromkeys(("failure", "failed", "denied", "unauthorized", "401", "403"), "failure"),
+    **dict.fromkeys(("error", "exception", "500", "503"), "error"),
+}
+
+# Outcome by HTTP status class (code // 100) for codes not listed above
+_HTTP_STATUS_OUTCOMES = {2: "success", 4: "failure", 5: "error"}
+
+# Separators ignored when matching action names ("Create_User" == "createuser")
+_ACTION_SEPARATORS = str.maketrans("", "", "_-")
+
+# Float values orjson cannot represent besides NaN (which fails value == value)
+_INFINITIES = (float("inf"), float("-inf"))
+
 
 def normalize_event(raw_event: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -22,66 +87,75 @@ def normalize_event(raw_event: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Normalized event dictionary matching canonical schema
     """
+    return _normalize(raw_event, None)
+
+
+def normalize_events(raw_events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Normalize a batch of raw events into canonical schema.
+
+    Batch counterpart of normalize_event: per-call state such as the
+    fallback timestamp for events without one is computed once for the
+    whole batch, and generated request IDs are cut from a single
+    os.urandom read. Raises on the first event that cannot be normalized.
+
+    Args:
+        raw_events: Raw event dictionaries
 
+    Returns:
+        Normalized event dictionaries, in input order
+    """
+    raw_events = list(raw_events)
+    now = datetime.now(timezone.utc)
+    request_ids = _generate_request_ids(len(raw_events))
+    return [_normalize(raw_event, now, request_ids) for raw_event in raw_events]
+
+
+def _normalize(
+    raw_event: Dict[str, Any],
+    now: Optional[datetime],
+    request_ids: Optional[Iterator[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Normalize one event.
+
+    `now` is the fallback timestamp and `request_ids` supplies generated
+    request IDs; the current time and uuid4() are used when they are None.
+    """
     normalized = {}
 
     # Normalize timestamp to UTC datetime
-    timestamp = raw_event.get("timestamp") or raw_event.get("@timestamp") or raw_event.get("time")
+    timestamp = _first(raw_event, _TIMESTAMP_KEYS)
     if timestamp:
         normalized["timestamp"] = _normalize_timestamp(timestamp)
     else:
         # Default to now if no timestamp
-        normalized["timestamp"] = datetime.now(timezone.utc)
+        normalized["timestamp"] = now or datetime.now(timezone.utc)
 
     # Normalize actor (user, username, identity)
-    normalized["actor"] = (
-        raw_event.get("actor")
-        or raw_event.get("user")
-        or raw_event.get("username")
-        or raw_event.get("identity", {}).get("principalId")
-    )
+    normalized["actor"] = _first(raw_event, _ACTOR_KEYS, _ACTOR_NESTED)
 
     # Normalize source IP (various field names)
-    normalized["source_ip"] = (
-        raw_event.get("source_ip")
-        or raw_event.get("sourceIP")
-        or raw_event.get("client_ip")
-        or raw_event.get("clientIP")
-        or raw_event.get("source", {}).get("ip")
-        or raw_event.get("network", {}).get("client_ip")
-    )
+    normalized["source_ip"] = _first(raw_event, _SOURCE_IP_KEYS, _SOURCE_IP_NESTED)
 
     # User agent
-    normalized["user_agent"] = raw_event.get("user_agent") or raw_event.get("userAgent")
+    normalized["user_agent"] = _first(raw_event, _USER_AGENT_KEYS)
 
     # Normalize action
-    action = raw_event.get("action") or raw_event.get("event") or raw_event.get("eventName")
+    action = _first(raw_event, _ACTION_KEYS)
     normalized["action"] = _normalize_action(action) if action else "unknown"
 
     # Resource
-    normalized["resource"] = (
-        raw_event.get("resource")
-        or raw_event.get("target")
-        or raw_event.get("object")
-        or raw_event.get("requestParameters", {}).get("resource")
-    )
+    normalized["resource"] = _first(raw_event, _RESOURCE_KEYS, _RESOURCE_NESTED)
 
     # Outcome (success, failure, error)
-    normalized["outcome"] = _normalize_outcome(
-        raw_event.get("outcome")
-        or raw_event.get("result")
-        or raw_event.get("status")
-        or raw_event.get("responseElements", {}).get("status")
-    )
-
-    # Request ID
-    normalized["request_id"] = (
-        raw_event.get("request_id")
-        or raw_event.get("requestId")
-        or raw_event.get("trace_id")
-        or raw_event.get("traceId")
-        or str(uuid.uuid4())  # Generate if not provided
-    )
+    normalized["outcome"] = _normalize_outcome(_first(raw_event, _OUTCOME_KEYS, _OUTCOME_NESTED))
+
+    # Request ID (generated if not provided)
+    request_id = _first(raw_event, _REQUEST_ID_KEYS)
+    if not request_id:
+        request_id = next(request_ids) if request_ids is not None else str(uuid.uuid4())
+    normalized["request_id"] = request_id
 
     # Store raw data for forensics (convert datetime objects to strings for JSON)
     normalized["raw_data"] = _serialize_for_json(raw_event)
@@ -89,14 +163,76 @@ def normalize_event(raw_event: Dict[str, Any]) -> Dict[str, Any]:
     return normalized
 
 
+def _generate_request_ids(count: int) -> Iterator[str]:
+    """Yield up to `count` random UUID4 strings from one os.urandom read."""
+    pool = os.urandom(16 * count)
+    for offset in range(0, len(pool), 16):
+        yield str(uuid.UUID(bytes=pool[offset : offset + 16], version=4))
+
+
+def _first(
+    data: Dict[str, Any],
+    keys: Tuple[str, ...],
+    nested: Tuple[Tuple[str, str], ...] = (),
+) -> Any:
+    """
+    Return the first truthy value among `keys`, then `(parent, child)` paths.
+
+    Mirrors an `or`-chain of `.get` calls: if nothing is truthy, the last
+    value looked up is returned. Nested parents that are not dicts are skipped.
+    """
+    value = None
+    for key in keys:
+        value = data.get(key)
+        if value:
+            return value
+    for parent, child in nested:
+        container = data.get(parent)
+        value = container.get(child) if isinstance(container, dict) else None
+        if value:
+            return value
+    return value
+
+
 def _serialize_for_json(data: Any) -> Any:
-    """Convert datetime objects to ISO format strings for JSON serialization."""
+    """
+    Convert data into JSON-compatible values (datetimes become ISO strings).
+
+    Round-trips through orjson so the traversal happens in C; types orjson
+    does not know are stringified. orjson rejects integers beyond 64 bits and
+    writes NaN/Infinity as null, so those events take the Python walk instead.
+    """
+    if _has_non_finite_float(data):
+        return _serialize_for_json_slow(data)
+    try:
+        return orjson.loads(orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS))
+    except orjson.JSONEncodeError:
+        return _serialize_for_json_slow(data)
+
+
+def _has_non_finite_float(data: Any) -> bool:
+    """Check nested dicts/lists for NaN or Infinity, which orjson would write as null."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type is dict:
+            stack.extend(value.values())
+        elif value_type is list or value_type is tuple:
+            stack.extend(value)
+        elif value_type is float and (value != value or value in _INFINITIES):
+            return True
+    return False
+
+
+def _serialize_for_json_slow(data: Any) -> Any:
+    """Convert datetime objects to ISO format strings, leaving other values as-is."""
     if isinstance(data, datetime):
         return data.isoformat()
     elif isinstance(data, dict):
-        return {k: _serialize_for_json(v) for k, v in data.items()}
+        return {k: _serialize_for_json_slow(v) for k, v in data.items()}
     elif isinstance(data, (list, tuple)):
-        return [_serialize_for_json(item) for item in data]
+        return [_serialize_for_json_slow(item) for item in data]
     return data
 
 
@@ -116,15 +252,41 @@ def _normalize_timestamp(timestamp: Any) -> datetime:
 
     if isinstance(timestamp, str):
         # ISO8601 or other string format
-        dt = parser.parse(timestamp)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc)
+        return _normalize_timestamp_str(timestamp)
 
     # Fallback to now
     return datetime.now(timezone.utc)
 
 
+@lru_cache(maxsize=8192)
+def _normalize_timestamp_str(timestamp: str) -> datetime:
+    """Parse a timestamp string to a timezone.utc datetime (cached; logs repeat values)."""
+    dt = _parse_timestamp_string(timestamp)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _parse_timestamp_string(timestamp: str) -> datetime:
+    """Parse a timestamp string, trying fast C parsers before dateutil."""
+    try:
+        # fromisoformat only accepts a "Z" suffix from Python 3.11
+        if timestamp.endswith(("Z", "z")):
+            return datetime.fromisoformat(timestamp[:-1] + "+00:00")
+        return datetime.fromisoformat(timestamp)
+    except ValueError:
+        pass
+
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(timestamp, fmt)
+        except ValueError:
+            continue
+
+    return parser.parse(timestamp)
+
+
+@lru_cache(maxsize=8192)
 def _normalize_action(action: str) -> str:
     """
     Normalize action names to consistent format.
@@ -136,32 +298,11 @@ def _normalize_action(action: str) -> str:
     """
     action = action.lower().strip()
 
-    # Map common action patterns
-    action_mappings = {
-        "login": "user.login",
-        "logout": "user.logout",
-        "signin": "user.login",
-        "signout": "user.logout",
-        "authenticate": "user.login",
-        "createuser": "iam.user.create",
-        "deleteuser": "iam.user.delete",
-        "updateuser": "iam.user.update",
-        "createrole": "iam.role.create",
-        "deleterole": "iam.role.delete",
-        "updaterole": "iam.role.update",
-        "attachrolepolicy": "iam.role.attach_policy",
-        "detachrolepolicy": "iam.role.detach_policy",
-        "putobject": "storage.object.create",
-        "getobject": "storage.object.read",
-        "deleteobject": "storage.object.delete",
-    }
-
     # Remove common prefixes (AWS style: s3:PutObject)
-    if ":" in action:
-        action = action.split(":")[-1]
+    action = action.rpartition(":")[2]
 
     # Check mappings
-    normalized = action_mappings.get(action.replace("_", "").replace("-", ""))
+    normalized = _ACTION_MAPPINGS.get(action.translate(_ACTION_SEPARATORS))
 
     return normalized or action
 
@@ -171,23 +312,20 @@ def _normalize_outcome(outcome: Any) -> Optional[str]:
     if not outcome:
         return None
 
-    outcome_str = str(outcome).lower()
+    return _normalize_outcome_str(str(outcome))
+
+
+@lru_cache(maxsize=1024)
+def _normalize_outcome_str(outcome: str) -> str:
+    """Map a non-empty outcome string (cached; logs repeat values)."""
+    outcome_str = outcome.lower()
 
-    if outcome_str in ("success", "succeeded", "ok", "200", "201", "204"):
-        return "success"
-    elif outcome_str in ("failure", "failed", "denied", "unauthorized", "401", "403"):
-        return "failure"
-    elif outcome_str in ("error", "exception", "500", "503"):
-        return "error"
+    normalized = _OUTCOME_MAPPINGS.get(outcome_str)
+    if normalized is not None:
+        return normalized
 
     # Try to infer from HTTP status codes
-    if outcome_str.isdigit():
-        code = int(outcome_str)
-        if 200 <= code < 300:
-            return "success"
-        elif 400 <= code < 500:
-            return "failure"
-        elif 500 <= code < 600:
-            return "error"
-
-    return outcome_str
+    try:
+        return _HTTP_STATUS_OUTCOMES.get(int(outcome_str) // 100, outcome_str)
+    except ValueError:
+        return outcome_str
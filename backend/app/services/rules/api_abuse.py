@@ -5,11 +5,11 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, List
 
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, literal, null, select, type_coerce, union_all
 from sqlalchemy.orm import Session
 
 from ...models import Event
-from .base import DetectionRule
+from .base import DetectionRule, aggregate_list
 
 
 class ApiAbuseRule(DetectionRule):
@@ -23,25 +23,11 @@ class ApiAbuseRule(DetectionRule):
     MITRE ATT&CK: T1498 (Network Denial of Service)
     """
 
-    @property
-    def rule_id(self) -> str:
-        return "api_abuse"
-
-    @property
-    def name(self) -> str:
-        return "API Abuse / Rate Spike Detection"
-
-    @property
-    def description(self) -> str:
-        return "Detects abnormally high API request rates indicating abuse"
-
-    @property
-    def severity(self) -> str:
-        return "medium"
-
-    @property
-    def window_minutes(self) -> int:
-        return 5  # 5-minute window
+    rule_id = "api_abuse"
+    name = "API Abuse / Rate Spike Detection"
+    description = "Detects abnormally high API request rates indicating abuse"
+    severity = "medium"
+    window_minutes = 5  # 5-minute window
 
     def detect(
         self, db: Session, window_start: datetime, window_end: datetime
@@ -51,31 +37,47 @@ class ApiAbuseRule(DetectionRule):
 
         alerts = []
 
-        # Check by source IP
-        ip_results = (
-            db.query(
-                Event.source_ip,
+        in_window = and_(Event.timestamp >= window_start, Event.timestamp <= window_end)
+        source_ips = aggregate_list(db, Event.source_ip, distinct=True, skip_empty=True)
+
+        # By source IP and by actor (authenticated abuse) in one UNION ALL
+        # statement; `group_type` tells the two groupings apart
+        by_ip = (
+            select(
+                literal("ip").label("group_type"),
+                Event.source_ip.label("group_key"),
                 func.count(Event.id).label("request_count"),
-                func.group_concat(Event.action).label("actions"),
                 func.count(func.distinct(Event.action)).label("unique_actions"),
+                type_coerce(null(), source_ips.type).label("source_ips"),
                 func.min(Event.timestamp).label("first_request"),
                 func.max(Event.timestamp).label("last_request"),
             )
-            .filter(
-                and_(
-                    Event.timestamp >= window_start,
-                    Event.timestamp <= window_end,
-                    Event.source_ip.isnot(None),
-                )
-            )
+            .where(in_window, Event.source_ip.isnot(None))
             .group_by(Event.source_ip)
             .having(func.count(Event.id) >= threshold)
-            .all()
         )
+        by_actor = (
+            select(
+                literal("actor").label("group_type"),
+                Event.actor.label("group_key"),
+                func.count(Event.id).label("request_count"),
+                func.count(func.distinct(Event.action)).label("unique_actions"),
+                source_ips.label("source_ips"),
+                func.min(Event.timestamp).label("first_request"),
+                func.max(Event.timestamp).label("last_request"),
+            )
+            .where(in_window, Event.actor.isnot(None))
+            .group_by(Event.actor)
+            .having(func.count(Event.id) >= threshold)
+        )
+        results = db.execute(union_all(by_ip, by_actor)).all()
+
+        ip_results = [result for result in results if result.group_type == "ip"]
+        actor_results = [result for result in results if result.group_type == "actor"]
 
         for result in ip_results:
             evidence = {
-                "source_ip": result.source_ip,
+                "source_ip": result.group_key,
                 "request_count": result.request_count,
                 "unique_actions": result.unique_actions,
                 "requests_per_second": round(
@@ -91,7 +93,7 @@ class ApiAbuseRule(DetectionRule):
                 {
                     "rule_id": self.rule_id,
                     "severity": self.severity,
-                    "summary": f"API abuse detected: {result.request_count} requests from {result.source_ip} in {self.window_minutes} minutes",
+                    "summary": f"API abuse detected: {result.request_count} requests from {result.group_key} in {self.window_minutes} minutes",
                     "evidence": evidence,
                     "alert_time": window_end,
                     "window_start": window_start,
@@ -99,33 +101,11 @@ class ApiAbuseRule(DetectionRule):
                 }
             )
 
-        # Check by actor (authenticated abuse)
-        actor_results = (
-            db.query(
-                Event.actor,
-                func.count(Event.id).label("request_count"),
-                func.group_concat(func.distinct(Event.source_ip)).label("source_ips"),
-                func.count(func.distinct(Event.action)).label("unique_actions"),
-                func.min(Event.timestamp).label("first_request"),
-                func.max(Event.timestamp).label("last_request"),
-            )
-            .filter(
-                and_(
-                    Event.timestamp >= window_start,
-                    Event.timestamp <= window_end,
-                    Event.actor.isnot(None),
-                )
-            )
-            .group_by(Event.actor)
-            .having(func.count(Event.id) >= threshold)
-            .all()
-        )
-
         for result in actor_results:
-            source_ips = result.source_ips.split(",") if result.source_ips else []
+            source_ips = list(result.source_ips)
 
             evidence = {
-                "actor": result.actor,
+                "actor": result.group_key,
                 "request_count": result.request_count,
                 "unique_actions": result.unique_actions,
                 "source_ips": source_ips,
@@ -142,7 +122,7 @@ class ApiAbuseRule(DetectionRule):
                 {
                     "rule_id": self.rule_id,
                     "severity": self.severity,
-                    "summary": f"API abuse detected: {result.request_count} requests from user {result.actor} in {self.window_minutes} minutes",
+                    "summary": f"API abuse detected: {result.request_count} requests from user {result.group_key} in {self.window_minutes} minutes",
                     "evidence": evidence,
                     "alert_time": window_end,
                     "window_start": window_start,
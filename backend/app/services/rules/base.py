@@ -4,43 +4,37 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, ClassVar, Dict, List
 
+from sqlalchemy import ARRAY, JSON, and_, func, literal
 from sqlalchemy.orm import Session
 
+from ...models import LOGIN_ACTION  # noqa: F401  (shared with the partial-index predicates)
+
+# Rows fetched per round-trip when a rule streams raw events
+SCAN_BATCH_SIZE = 1000
+
 
 class DetectionRule(ABC):
     """Base class for all detection rules."""
 
-    @property
-    @abstractmethod
-    def rule_id(self) -> str:
-        """Unique rule identifier."""
-        pass
-
-    @property
-    @abstractmethod
-    def name(self) -> str:
-        """Human-readable rule name."""
-        pass
+    # Rule metadata, set as plain class attributes by each concrete rule
+    rule_id: ClassVar[str]  # Unique rule identifier
+    name: ClassVar[str]  # Human-readable rule name
+    description: ClassVar[str]  # Rule description
+    severity: ClassVar[str]  # Default severity: low, medium, high, critical
+    window_minutes: ClassVar[int]  # Time window to analyze (in minutes)
 
-    @property
-    @abstractmethod
-    def description(self) -> str:
-        """Rule description."""
-        pass
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
 
-    @property
-    @abstractmethod
-    def severity(self) -> str:
-        """Default severity: low, medium, high, critical."""
-        pass
+        # Abstract intermediate classes may leave metadata to their subclasses
+        if getattr(cls.detect, "__isabstractmethod__", False):
+            return
 
-    @property
-    @abstractmethod
-    def window_minutes(self) -> int:
-        """Time window to analyze (in minutes)."""
-        pass
+        missing = [attr for attr in DetectionRule.__annotations__ if not hasattr(cls, attr)]
+        if missing:
+            raise TypeError(f"{cls.__name__} must define {', '.join(missing)}")
 
     @abstractmethod
     def detect(
@@ -58,3 +52,35 @@ class DetectionRule(ABC):
             List of alert dictionaries with evidence
         """
         pass
+
+
+def aggregate_list(
+    db: Session, column: Any, distinct: bool = False, skip_empty: bool = False
+) -> Any:
+    """
+    Aggregate a column into a Python list per group.
+
+    Uses array_agg on PostgreSQL and json_group_array elsewhere (SQLite), so
+    values come back typed instead of as a delimited string. NULLs are kept
+    unless `skip_empty` is set, which drops NULL and empty-string values with
+    an aggregate FILTER clause before they are collected.
+    """
+    expr = func.distinct(column) if distinct else column
+
+    if db.get_bind().dialect.name == "postgresql":
+        list_type = ARRAY(column.type)
+        aggregate = func.array_agg(expr, type_=list_type)
+        if skip_empty:
+            # array_agg yields NULL, not an empty array, when every row is filtered
+            return func.coalesce(
+                aggregate.filter(_is_not_empty(column)), literal([], list_type), type_=list_type
+            )
+        return aggregate
+
+    aggregate = func.json_group_array(expr, type_=JSON)
+    return aggregate.filter(_is_not_empty(column)) if skip_empty else aggregate
+
+
+def _is_not_empty(column: Any) -> Any:
+    """Predicate matching non-NULL, non-empty-string values of `column`."""
+    return and_(column.isnot(None), column != "")
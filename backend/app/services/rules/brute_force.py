@@ -9,7 +9,7 @@ from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 
 from ...models import Event
-from .base import DetectionRule
+from .base import LOGIN_ACTION, DetectionRule, aggregate_list
 
 
 class BruteForceRule(DetectionRule):
@@ -23,25 +23,11 @@ class BruteForceRule(DetectionRule):
     MITRE ATT&CK: T1110 (Brute Force)
     """
 
-    @property
-    def rule_id(self) -> str:
-        return "brute_force_login"
-
-    @property
-    def name(self) -> str:
-        return "Brute Force Login Detection"
-
-    @property
-    def description(self) -> str:
-        return "Detects multiple failed login attempts from the same IP address"
-
-    @property
-    def severity(self) -> str:
-        return "high"
-
-    @property
-    def window_minutes(self) -> int:
-        return 15  # 15-minute window
+    rule_id = "brute_force_login"
+    name = "Brute Force Login Detection"
+    description = "Detects multiple failed login attempts from the same IP address"
+    severity = "high"
+    window_minutes = 15  # 15-minute window
 
     def detect(
         self, db: Session, window_start: datetime, window_end: datetime
@@ -54,8 +40,8 @@ class BruteForceRule(DetectionRule):
             db.query(
                 Event.source_ip,
                 func.count(Event.id).label("attempt_count"),
-                func.group_concat(Event.id).label("event_ids"),
-                func.group_concat(Event.actor).label("actors"),
+                aggregate_list(db, Event.id).label("event_ids"),
+                aggregate_list(db, Event.actor, distinct=True, skip_empty=True).label("actors"),
                 func.min(Event.timestamp).label("first_attempt"),
                 func.max(Event.timestamp).label("last_attempt"),
             )
@@ -63,7 +49,7 @@ class BruteForceRule(DetectionRule):
                 and_(
                     Event.timestamp >= window_start,
                     Event.timestamp <= window_end,
-                    Event.action.in_(["user.login", "login", "signin", "authenticate"]),
+                    Event.action == LOGIN_ACTION,
                     Event.outcome == "failure",
                     Event.source_ip.isnot(None),
                 )
@@ -75,9 +61,8 @@ class BruteForceRule(DetectionRule):
 
         alerts = []
         for result in results:
-            # Parse event IDs and actors
-            event_ids = [int(x) for x in result.event_ids.split(",")]
-            actors = list(set(result.actors.split(","))) if result.actors else []
+            event_ids = list(result.event_ids)
+            actors = list(result.actors)
 
             evidence = {
                 "source_ip": result.source_ip,
@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+import socket
+import struct
 from datetime import datetime
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import and_
+from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
 from ...models import Event
-from .base import DetectionRule
+from .base import LOGIN_ACTION, SCAN_BATCH_SIZE, DetectionRule
+
+# Estimated distance (km) by number of differing IPv4 octets
+_OCTET_DIFF_DISTANCE_KM = (0, 50, 300, 1000, 2500)
 
 
 class ImpossibleTravelRule(DetectionRule):
@@ -23,103 +29,87 @@ class ImpossibleTravelRule(DetectionRule):
     MITRE ATT&CK: T1078 (Valid Accounts - credential compromise)
     """
 
-    @property
-    def rule_id(self) -> str:
-        return "impossible_travel"
-
-    @property
-    def name(self) -> str:
-        return "Impossible Travel Detection"
-
-    @property
-    def description(self) -> str:
-        return "Detects logins from geographically impossible locations within short timeframes"
-
-    @property
-    def severity(self) -> str:
-        return "high"
-
-    @property
-    def window_minutes(self) -> int:
-        return 60  # 1-hour window
+    rule_id = "impossible_travel"
+    name = "Impossible Travel Detection"
+    description = "Detects logins from geographically impossible locations within short timeframes"
+    severity = "high"
+    window_minutes = 60  # 1-hour window
 
     def detect(
         self, db: Session, window_start: datetime, window_end: datetime
     ) -> List[Dict[str, Any]]:
         """Detect impossible travel."""
-        # Get login events grouped by user
-        events = (
-            db.query(Event)
-            .filter(
+        # Get successful logins ordered by user, then time
+        stmt = (
+            select(Event.id, Event.timestamp, Event.actor, Event.source_ip)
+            .where(
                 and_(
                     Event.timestamp >= window_start,
                     Event.timestamp <= window_end,
-                    Event.action.in_(["user.login", "login", "signin", "authenticate"]),
+                    Event.action == LOGIN_ACTION,
                     Event.outcome == "success",
                     Event.actor.isnot(None),
                     Event.source_ip.isnot(None),
                 )
             )
             .order_by(Event.actor, Event.timestamp)
-            .all()
+            .execution_options(yield_per=SCAN_BATCH_SIZE)
         )
-
-        # Group events by actor
-        user_events = {}
-        for event in events:
-            if event.actor not in user_events:
-                user_events[event.actor] = []
-            user_events[event.actor].append(event)
+        events = db.execute(stmt)
 
         alerts = []
 
-        # Check for impossible travel per user
-        for actor, actor_events in user_events.items():
-            if len(actor_events) < 2:
+        # Rows are ordered by (actor, timestamp), so consecutive rows of the same
+        # actor are that user's consecutive logins; one streaming pass covers every user
+        previous = None
+        for event in events:
+            event1, event2, previous = previous, event, event
+            if event1 is None:
+                continue
+            if event1.actor != event2.actor or event1.source_ip == event2.source_ip:
+                continue
+
+            actor = event1.actor
+            time_delta = (event2.timestamp - event1.timestamp).total_seconds() / 3600  # hours
+            if time_delta >= 2:
                 continue
 
-            # Check consecutive logins
-            for i in range(len(actor_events) - 1):
-                event1 = actor_events[i]
-                event2 = actor_events[i + 1]
-
-                # Simple heuristic: different IP prefixes indicate different locations
-                # In production, use GeoIP database
-                distance_km = self._estimate_distance(event1.source_ip, event2.source_ip)
-                time_delta = (event2.timestamp - event1.timestamp).total_seconds() / 3600  # hours
-
-                # If locations are far apart and time is short
-                if distance_km > 500 and time_delta < 2:  # 500km in < 2 hours
-                    evidence = {
-                        "actor": actor,
-                        "location1": {
-                            "ip": event1.source_ip,
-                            "timestamp": event1.timestamp.isoformat(),
-                            "event_id": event1.id,
-                        },
-                        "location2": {
-                            "ip": event2.source_ip,
-                            "timestamp": event2.timestamp.isoformat(),
-                            "event_id": event2.id,
-                        },
-                        "estimated_distance_km": distance_km,
-                        "time_delta_hours": round(time_delta, 2),
-                        "impossible_speed_kmh": round(distance_km / time_delta, 2)
-                        if time_delta > 0
-                        else 0,
+            # Simple heuristic: different IP prefixes indicate different locations
+            # In production, use GeoIP database
+            distance_km = self._estimate_distance(event1.source_ip, event2.source_ip)
+
+            # If locations are far apart and time is short
+            if distance_km > 500:  # 500km in < 2 hours
+                evidence = {
+                    "actor": actor,
+                    "location1": {
+                        "ip": event1.source_ip,
+                        "timestamp": event1.timestamp.isoformat(),
+                        "event_id": event1.id,
+                    },
+                    "location2": {
+                        "ip": event2.source_ip,
+                        "timestamp": event2.timestamp.isoformat(),
+                        "event_id": event2.id,
+                    },
+                    "estimated_distance_km": distance_km,
+                    "time_delta_hours": round(time_delta, 2),
+                    "impossible_speed_kmh": round(distance_km / time_delta, 2)
+                    if time_delta > 0
+                    else 0,
+                }
+
+                alerts.append(
+                    {
+                        "rule_id": self.rule_id,
+                        "severity": self.severity,
+                        "summary": f"Impossible travel detected: {actor} logged in from {event1.source_ip} and {event2.source_ip} within {round(time_delta, 1)} hours",
+                        "evidence": evidence,
+                        "alert_time": window_end,
+                        "window_start": window_start,
+                        "window_end": window_end,
                     }
-
-                    alerts.append(
-                        {
-                            "rule_id": self.rule_id,
-                            "severity": self.severity,
-                            "summary": f"Impossible travel detected: {actor} logged in from {event1.source_ip} and {event2.source_ip} within {round(time_delta, 1)} hours",
-                            "evidence": evidence,
-                            "alert_time": window_end,
-                            "window_start": window_start,
-                            "window_end": window_end,
-                        }
-                    )
+                )
 
         return alerts
 
@@ -133,15 +123,34 @@ class ImpossibleTravelRule(DetectionRule):
         if ip1 == ip2:
             return 0.0
 
-        # Parse IP prefixes
-        parts1 = ip1.split(".")
-        parts2 = ip2.split(".")
-
-        # Count differing octets (very rough heuristic)
-        diffs = sum(1 for i in range(min(len(parts1), len(parts2))) if parts1[i] != parts2[i])
+        int1 = _ipv4_to_int(ip1)
+        int2 = _ipv4_to_int(ip2)
+        if int1 is not None and int2 is not None:
+            # Count differing octets from the XOR of the packed addresses
+            xor = int1 ^ int2
+            diffs = (
+                (xor >> 24 != 0)
+                + ((xor >> 16) & 0xFF != 0)
+                + ((xor >> 8) & 0xFF != 0)
+                + (xor & 0xFF != 0)
+            )
+        else:
+            # Not dotted-quad IPv4: compare dot-separated parts as strings
+            parts1 = ip1.split(".")
+            parts2 = ip2.split(".")
+            diffs = sum(1 for p1, p2 in zip(parts1, parts2) if p1 != p2)
 
         # Heuristic distance estimation
         # Same /8: 0-100km, /16: 100-500km, /24: 500-2000km, different: 2000+km
-        distance_map = {0: 0, 1: 50, 2: 300, 3: 1000, 4: 2500}
-
-        return distance_map.get(diffs, 2500)
+        return _OCTET_DIFF_DISTANCE_KM[min(diffs, 4)]
+
+
+@lru_cache(maxsize=4096)
+def _ipv4_to_int(ip: str) -> Optional[int]:
+    """Pack a dotted-quad IPv4 address into an int, or None if it is not one."""
+    if ip.count(".") != 3:
+        return None
+    try:
+        return struct.unpack("!I", socket.inet_aton(ip))[0]
+    except OSError:
+        return None
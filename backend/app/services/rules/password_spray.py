@@ -9,7 +9,7 @@ from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 
 from ...models import Event
-from .base import DetectionRule
+from .base import LOGIN_ACTION, DetectionRule, aggregate_list
 
 
 class PasswordSprayRule(DetectionRule):
@@ -23,25 +23,11 @@ class PasswordSprayRule(DetectionRule):
     MITRE ATT&CK: T1110.003 (Password Spraying)
     """
 
-    @property
-    def rule_id(self) -> str:
-        return "password_spray"
-
-    @property
-    def name(self) -> str:
-        return "Password Spray Detection"
-
-    @property
-    def description(self) -> str:
-        return "Detects login attempts targeting multiple users from a single IP"
-
-    @property
-    def severity(self) -> str:
-        return "critical"
-
-    @property
-    def window_minutes(self) -> int:
-        return 30  # 30-minute window
+    rule_id = "password_spray"
+    name = "Password Spray Detection"
+    description = "Detects login attempts targeting multiple users from a single IP"
+    severity = "critical"
+    window_minutes = 30  # 30-minute window
 
     def detect(
         self, db: Session, window_start: datetime, window_end: datetime
@@ -55,8 +41,8 @@ class PasswordSprayRule(DetectionRule):
                 Event.source_ip,
                 func.count(func.distinct(Event.actor)).label("unique_users"),
                 func.count(Event.id).label("total_attempts"),
-                func.group_concat(Event.id).label("event_ids"),
-                func.group_concat(func.distinct(Event.actor)).label("actors"),
+                aggregate_list(db, Event.id).label("event_ids"),
+                aggregate_list(db, Event.actor, distinct=True).label("actors"),
                 func.min(Event.timestamp).label("first_attempt"),
                 func.max(Event.timestamp).label("last_attempt"),
             )
@@ -64,7 +50,7 @@ class PasswordSprayRule(DetectionRule):
                 and_(
                     Event.timestamp >= window_start,
                     Event.timestamp <= window_end,
-                    Event.action.in_(["user.login", "login", "signin", "authenticate"]),
+                    Event.action == LOGIN_ACTION,
                     Event.source_ip.isnot(None),
                     Event.actor.isnot(None),
                 )
@@ -76,9 +62,8 @@ class PasswordSprayRule(DetectionRule):
 
         alerts = []
         for result in results:
-            # Parse event IDs and actors
-            event_ids = [int(x) for x in result.event_ids.split(",")]
-            actors = result.actors.split(",") if result.actors else []
+            event_ids = list(result.event_ids)
+            actors = list(result.actors)
 
             evidence = {
                 "source_ip": result.source_ip,
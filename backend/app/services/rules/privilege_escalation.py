@@ -5,11 +5,11 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, List
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
 
 from ...models import Event
-from .base import DetectionRule
+from .base import SCAN_BATCH_SIZE, DetectionRule
 
 
 class PrivilegeEscalationRule(DetectionRule):
@@ -24,27 +24,13 @@ class PrivilegeEscalationRule(DetectionRule):
     MITRE ATT&CK: T1078.004 (Cloud Accounts), T1548 (Abuse Elevation Control Mechanism)
     """
 
-    @property
-    def rule_id(self) -> str:
-        return "privilege_escalation"
+    rule_id = "privilege_escalation"
+    name = "Privilege Escalation Detection"
+    description = "Detects IAM privilege changes and role elevations"
+    severity = "critical"
+    window_minutes = 60  # 1-hour window
 
-    @property
-    def name(self) -> str:
-        return "Privilege Escalation Detection"
-
-    @property
-    def description(self) -> str:
-        return "Detects IAM privilege changes and role elevations"
-
-    @property
-    def severity(self) -> str:
-        return "critical"
-
-    @property
-    def window_minutes(self) -> int:
-        return 60  # 1-hour window
-
-    # Suspicious IAM actions
+    # Suspicious IAM actions in canonical (normalized) form, matched exactly
     PRIVILEGE_ACTIONS = [
         "iam.role.create",
         "iam.role.update",
@@ -60,6 +46,10 @@ class PrivilegeEscalationRule(DetectionRule):
         "permissions.grant",
         "permissions.modify",
         "admin.action",
+    ]
+
+    # Raw provider action names the normalizer may pass through, matched as substrings
+    LEGACY_PRIVILEGE_SUBSTRINGS = [
         "createrole",
         "updaterole",
         "attachrolepolicy",
@@ -72,18 +62,34 @@ class PrivilegeEscalationRule(DetectionRule):
     ) -> List[Dict[str, Any]]:
         """Detect privilege escalation."""
         # Query privilege-related events
-        events = (
-            db.query(Event)
-            .filter(
+        stmt = (
+            select(
+                Event.id,
+                Event.timestamp,
+                Event.actor,
+                Event.source_ip,
+                Event.user_agent,
+                Event.action,
+                Event.resource,
+                Event.outcome,
+            )
+            .where(
                 and_(
                     Event.timestamp >= window_start,
                     Event.timestamp <= window_end,
-                    or_(*[Event.action.like(f"%{action}%") for action in self.PRIVILEGE_ACTIONS]),
+                    or_(
+                        Event.action.in_(self.PRIVILEGE_ACTIONS),
+                        *[
+                            Event.action.like(f"%{action}%")
+                            for action in self.LEGACY_PRIVILEGE_SUBSTRINGS
+                        ],
+                    ),
                 )
             )
             .order_by(Event.timestamp)
-            .all()
+            .execution_options(yield_per=SCAN_BATCH_SIZE)
         )
+        events = db.execute(stmt)
 
         alerts = []
 
@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Any, Dict, List
 
 from sqlalchemy import and_
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 
 from ...models import Event
 from .base import DetectionRule
@@ -23,25 +23,11 @@ class SuspiciousApiKeyRule(DetectionRule):
     MITRE ATT&CK: T1078.004 (Valid Accounts: Cloud Accounts)
     """
 
-    @property
-    def rule_id(self) -> str:
-        return "suspicious_api_key"
-
-    @property
-    def name(self) -> str:
-        return "Suspicious API Key Generation"
-
-    @property
-    def description(self) -> str:
-        return "Detects API key generation outside of standard business hours"
-
-    @property
-    def severity(self) -> str:
-        return "medium"
-
-    @property
-    def window_minutes(self) -> int:
-        return 60  # 1-hour window
+    rule_id = "suspicious_api_key"
+    name = "Suspicious API Key Generation"
+    description = "Detects API key generation outside of standard business hours"
+    severity = "medium"
+    window_minutes = 60  # 1-hour window
 
     def detect(
         self, db: Session, window_start: datetime, window_end: datetime
@@ -49,6 +35,7 @@ class SuspiciousApiKeyRule(DetectionRule):
         """Detect API key generation outside business hours."""
         events = (
             db.query(Event)
+            .options(undefer(Event.raw_data))  # region is read from raw_data
             .filter(
                 and_(
                     Event.timestamp >= window_start,
@@ -4,13 +4,65 @@ from __future__ import annotations
 
 import re
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import and_
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import Session
 
 from ...models import Event
-from .base import DetectionRule
+from .base import DetectionRule, aggregate_list
+
+# Suspicious patterns
+SUSPICIOUS_PATTERNS = (
+    r"^$",  # Empty
+    r"curl",
+    r"wget",
+    r"python-requests",
+    r"python-urllib",
+    r"scrapy",
+    r"bot",
+    r"crawler",
+    r"spider",
+    r"httpx",
+    r"http\.client",
+    r"libwww",
+    r"^-$",  # Single dash
+)
+
+# All patterns as one case-insensitive alternation, to reject benign user agents in one scan
+_COMBINED_PATTERN = re.compile("|".join(SUSPICIOUS_PATTERNS), re.IGNORECASE)
+# Individual patterns in priority order, to report which one matched
+_COMPILED_PATTERNS = tuple(
+    (pattern, re.compile(pattern, re.IGNORECASE)) for pattern in SUSPICIOUS_PATTERNS
+)
+
+# Unescaped regex metacharacters; patterns must be literal so SQL can prefilter them
+_REGEX_META = re.compile(r"(?<!\\)[.^$*+?{}\[\]|()]|\\[0-9A-Za-z]")
+
+
+def _split_patterns(patterns: Iterable[str]) -> Tuple[Dict[str, str], Tuple[str, ...]]:
+    """Split patterns into anchored exact values and literal substrings (unescaped)."""
+    exact: Dict[str, str] = {}
+    substrings: List[str] = []
+    for pattern in patterns:
+        anchored = pattern.startswith("^") and pattern.endswith("$")
+        body = pattern[1:-1] if anchored else pattern
+        if _REGEX_META.search(body):
+            raise ValueError(f"Suspicious UA pattern {pattern!r} has no SQL prefilter equivalent")
+        literal = re.sub(r"\\(.)", r"\1", body)
+        if anchored:
+            exact[literal] = pattern
+        else:
+            substrings.append(literal)
+    return exact, tuple(substrings)
+
+
+# Anchored patterns are plain equality checks; the rest are SQL LIKE terms
+_EXACT_PATTERNS, _PREFILTER_TERMS = _split_patterns(SUSPICIOUS_PATTERNS)
+_PREFILTER = or_(
+    Event.user_agent.in_(list(_EXACT_PATTERNS)),
+    *(Event.user_agent.ilike(f"%{term}%") for term in _PREFILTER_TERMS),
+)
 
 
 class SuspiciousUserAgentRule(DetectionRule):
@@ -25,129 +77,84 @@ class SuspiciousUserAgentRule(DetectionRule):
     MITRE ATT&CK: T1071 (Application Layer Protocol)
     """
 
-    @property
-    def rule_id(self) -> str:
-        return "suspicious_user_agent"
-
-    @property
-    def name(self) -> str:
-        return "Suspicious User-Agent Detection"
-
-    @property
-    def description(self) -> str:
-        return "Detects requests with suspicious or automated user agent strings"
-
-    @property
-    def severity(self) -> str:
-        return "medium"
-
-    @property
-    def window_minutes(self) -> int:
-        return 15  # 15-minute window
-
-    # Suspicious patterns
-    SUSPICIOUS_PATTERNS = [
-        r"^$",  # Empty
-        r"curl",
-        r"wget",
-        r"python-requests",
-        r"python-urllib",
-        r"scrapy",
-        r"bot",
-        r"crawler",
-        r"spider",
-        r"httpx",
-        r"http\.client",
-        r"libwww",
-        r"^-$",  # Single dash
-    ]
+    rule_id = "suspicious_user_agent"
+    name = "Suspicious User-Agent Detection"
+    description = "Detects requests with suspicious or automated user agent strings"
+    severity = "medium"
+    window_minutes = 15  # 15-minute window
 
     def detect(
         self, db: Session, window_start: datetime, window_end: datetime
     ) -> List[Dict[str, Any]]:
         """Detect suspicious user agents."""
-        # Get events with user agents
-        events = (
-            db.query(Event)
-            .filter(
+        threshold = 5  # 5+ requests with suspicious UA
+
+        # Aggregate candidate events per user agent; the SQL prefilter is a
+        # superset of the patterns, which are checked once per group below
+        results = db.execute(
+            select(
+                Event.user_agent,
+                func.count(Event.id).label("request_count"),
+                aggregate_list(db, Event.actor, distinct=True, skip_empty=True).label("actors"),
+                aggregate_list(db, Event.source_ip, distinct=True, skip_empty=True).label(
+                    "source_ips"
+                ),
+                aggregate_list(db, Event.id).label("event_ids"),
+            )
+            .where(
                 and_(
                     Event.timestamp >= window_start,
                     Event.timestamp <= window_end,
                     Event.user_agent.isnot(None),
+                    _PREFILTER,
                 )
             )
-            .all()
+            .group_by(Event.user_agent)
+            .having(func.count(Event.id) >= threshold)
         )
 
-        # Group by user agent and check patterns
-        suspicious_groups = {}
+        # Generate alerts for suspicious user agents with multiple requests
+        alerts = []
 
-        for event in events:
-            ua = event.user_agent or ""
+        for result in results:
+            ua = result.user_agent
 
             # Check if user agent matches suspicious patterns
-            if self._is_suspicious(ua):
-                if ua not in suspicious_groups:
-                    suspicious_groups[ua] = {
-                        "user_agent": ua,
-                        "event_ids": [],
-                        "actors": set(),
-                        "source_ips": set(),
-                        "count": 0,
-                    }
-
-                suspicious_groups[ua]["event_ids"].append(event.id)
-                suspicious_groups[ua]["count"] += 1
-                if event.actor:
-                    suspicious_groups[ua]["actors"].add(event.actor)
-                if event.source_ip:
-                    suspicious_groups[ua]["source_ips"].add(event.source_ip)
-
-        # Generate alerts for groups with multiple requests
-        alerts = []
-        threshold = 5  # 5+ requests with suspicious UA
-
-        for ua, data in suspicious_groups.items():
-            if data["count"] >= threshold:
-                evidence = {
-                    "user_agent": ua,
-                    "request_count": data["count"],
-                    "actors": list(data["actors"]),
-                    "source_ips": list(data["source_ips"]),
-                    "event_ids": data["event_ids"],
-                    "pattern_matched": self._get_matched_pattern(ua),
+            pattern = self._match_suspicious(ua)
+            if pattern is None:
+                continue
+
+            evidence = {
+                "user_agent": ua,
+                "request_count": result.request_count,
+                "actors": list(result.actors),
+                "source_ips": list(result.source_ips),
+                "event_ids": list(result.event_ids),
+                "pattern_matched": pattern,
+            }
+
+            alerts.append(
+                {
+                    "rule_id": self.rule_id,
+                    "severity": self.severity,
+                    "summary": f"Suspicious user agent detected: {result.request_count} requests with automated/suspicious UA",
+                    "evidence": evidence,
+                    "alert_time": window_end,
+                    "window_start": window_start,
+                    "window_end": window_end,
                 }
-
-                alerts.append(
-                    {
-                        "rule_id": self.rule_id,
-                        "severity": self.severity,
-                        "summary": f"Suspicious user agent detected: {data['count']} requests with automated/suspicious UA",
-                        "evidence": evidence,
-                        "alert_time": window_end,
-                        "window_start": window_start,
-                        "window_end": window_end,
-                    }
-                )
+            )
 
         return alerts
 
-    def _is_suspicious(self, user_agent: str) -> bool:
-        """Check if user agent matches suspicious patterns."""
-        ua_lower = user_agent.lower()
-
-        for pattern in self.SUSPICIOUS_PATTERNS:
-            if re.search(pattern, ua_lower, re.IGNORECASE):
-                return True
-
-        return False
-
-    def _get_matched_pattern(self, user_agent: str) -> str:
-        """Get the pattern that matched the suspicious UA."""
-        ua_lower = user_agent.lower()
+    def _match_suspicious(self, user_agent: str) -> Optional[str]:
+        """Return the suspicious pattern the user agent matches, or None."""
+        pattern = _EXACT_PATTERNS.get(user_agent)
+        if pattern is not None:
+            return pattern
 
-        for pattern in self.SUSPICIOUS_PATTERNS:
-            if re.search(pattern, ua_lower, re.IGNORECASE):
-                return pattern
+        if not _COMBINED_PATTERN.search(user_agent):
+            return None
 
-        return "unknown"
+        # The alternation finds the leftmost match; report the first listed pattern instead
+        return next(pattern for pattern, regex in _COMPILED_PATTERNS if regex.search(user_agent))
@@ -1,5 +1,7 @@
 """Tests for API endpoints."""
 
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from app.database import Base, engine
 from app.main import app
@@ -42,6 +44,20 @@ def test_ingest_single_event(client):
     assert len(data["event_ids"]) == 1
 
 
+def test_ingest_event_with_big_int_raw_data(client):
+    """Test that integers beyond 64 bits in raw data are still stored."""
+    event = {
+        "timestamp": "2024-02-09T20:00:00Z",
+        "actor": "test_user",
+        "action": "user.login",
+        "raw_data": {"big": 2**70},
+    }
+
+    response = client.post("/api/v1/ingest", json=event)
+    assert response.status_code == 200
+    assert response.json()["ingested"] == 1
+
+
 def test_ingest_batch_events(client):
     """Test ingesting multiple events."""
     events = [
@@ -65,6 +81,64 @@ def test_ingest_batch_events(client):
     assert len(data["event_ids"]) == 2
 
 
+def test_ingest_batch_returns_ids_in_order(client):
+    """Test that batch ingestion returns one ID per event in submission order."""
+    events = [
+        {
+            "timestamp": f"2024-02-09T20:{i:02d}:00Z",
+            "actor": f"user{i}",
+            "action": "user.login",
+        }
+        for i in range(25)
+    ]
+
+    response = client.post("/api/v1/ingest", json=events)
+    assert response.status_code == 200
+
+    event_ids = response.json()["event_ids"]
+    assert len(event_ids) == 25
+    assert event_ids == sorted(set(event_ids))
+
+
+def test_ingest_batch_endpoint(client):
+    """Test ingesting a JSON array via the batch endpoint."""
+    events = [
+        {"timestamp": "2024-02-09T20:00:00Z", "actor": "user1", "action": "user.login"},
+        {"timestamp": "2024-02-09T20:01:00Z", "actor": "user2", "action": "user.logout"},
+    ]
+
+    response = client.post("/api/v1/ingest/batch", json=events)
+    assert response.status_code == 200
+    assert response.json()["ingested"] == 2
+
+    # Missing required action field
+    response = client.post("/api/v1/ingest/batch", json=[{"timestamp": "2024-02-09T20:00:00Z"}])
+    assert response.status_code == 422
+
+
+def test_ingest_ndjson(client):
+    """Test streaming NDJSON ingestion with a bad line and blank lines."""
+    body = (
+        '{"timestamp": "2024-02-09T20:00:00Z", "actor": "user1", "action": "user.login"}\n'
+        "\n"
+        "not-json\n"
+        '{"timestamp": "2024-02-09T20:01:00Z", "actor": "user2", "action": "user.logout"}'
+    )
+
+    response = client.post(
+        "/api/v1/ingest/ndjson",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["ingested"] == 2
+    assert len(data["event_ids"]) == 2
+    assert len(data["errors"]) == 1
+    assert data["errors"][0].startswith("Line 3:")
+
+
 def test_list_alerts_empty(client):
     """Test listing alerts when none exist."""
     response = client.get("/api/v1/alerts")
@@ -83,6 +157,48 @@ def test_run_detections(client):
     assert "execution_time_ms" in data
 
 
+def test_run_detections_in_background(client):
+    """Test queuing a detection run and polling its result."""
+    response = client.post("/api/v1/detections/run/async")
+    assert response.status_code == 202
+
+    run_id = response.json()["run_id"]
+
+    # TestClient executes background tasks before returning the response
+    response = client.get(f"/api/v1/detections/runs/{run_id}")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["status"] == "completed"
+    assert "alerts_generated" in data["result"]
+
+
+def test_get_unknown_detection_run(client):
+    """Test polling a detection run that does not exist."""
+    response = client.get("/api/v1/detections/runs/missing")
+    assert response.status_code == 404
+
+
+def test_list_alerts_omits_evidence(client):
+    """Test that the alert list omits evidence and the detail view includes it."""
+    event = {
+        "timestamp": (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat(),
+        "actor": "admin_user",
+        "action": "iam.role.attach_policy",
+        "resource": "admin-role",
+    }
+
+    client.post("/api/v1/ingest", json=event)
+    client.post("/api/v1/detections/run")
+
+    alerts = client.get("/api/v1/alerts").json()
+    assert len(alerts) >= 1
+    assert "evidence" not in alerts[0]
+
+    detail = client.get(f"/api/v1/alerts/{alerts[0]['id']}").json()
+    assert detail["evidence"]["actor"] == "admin_user"
+
+
 def test_update_alert_status(client):
     """Test updating alert status."""
     # First, create an event and generate an alert
@@ -152,3 +268,17 @@ def test_list_allowlist(client):
 
     entries = response.json()
     assert len(entries) >= 1
+
+
+def test_remove_from_allowlist(client):
+    """Test removing an allowlist entry, then removing it again."""
+    entry = client.post(
+        "/api/v1/allowlist",
+        json={"entry_type": "ip", "entry_value": "10.0.0.1", "reason": "Test"},
+    ).json()
+
+    response = client.delete(f"/api/v1/allowlist/{entry['id']}")
+    assert response.status_code == 200
+
+    response = client.delete(f"/api/v1/allowlist/{entry['id']}")
+    assert response.status_code == 404
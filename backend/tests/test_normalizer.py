@@ -1,8 +1,11 @@
 """Tests for event normalization."""
 
+import math
+import uuid
 from datetime import datetime, timezone
 
-from app.services.normalizer import normalize_event
+from app.services import normalizer
+from app.services.normalizer import normalize_event, normalize_events
 
 
 def test_normalize_timestamp_iso8601():
@@ -25,6 +28,21 @@ def test_normalize_timestamp_unix():
     assert normalized["timestamp"].tzinfo == timezone.utc
 
 
+def test_normalize_timestamp_string_formats():
+    """Test ISO8601, access-log, and free-form timestamp strings."""
+    expected = datetime(2024, 2, 9, 20, 0, tzinfo=timezone.utc)
+
+    for timestamp in (
+        "2024-02-09T20:00:00Z",
+        "2024-02-09T21:00:00+01:00",
+        "2024-02-09 20:00:00",
+        "09/Feb/2024:20:00:00 +0000",
+        "Feb 9 2024 8:00 PM",
+    ):
+        normalized = normalize_event({"timestamp": timestamp, "action": "login"})
+        assert normalized["timestamp"] == expected, timestamp
+
+
 def test_normalize_actor_variations():
     """Test actor field normalization from various field names."""
     # Test 'user' field
@@ -111,3 +129,54 @@ def test_normalize_stores_raw_data():
 
     assert normalized["raw_data"] == event
     assert normalized["raw_data"]["custom_field"] == "custom_value"
+
+
+def test_normalize_events_batch():
+    """Test batch normalization matches single-event normalization."""
+    events = [
+        {"timestamp": "2024-02-09T20:00:00Z", "user": "alice", "action": "login"},
+        {"username": "bob", "action": "CreateUser", "request_id": "req-1"},
+    ]
+
+    normalized = normalize_events(events)
+
+    assert [n["actor"] for n in normalized] == ["alice", "bob"]
+    assert [n["action"] for n in normalized] == ["user.login", "iam.user.create"]
+    assert normalized[0]["timestamp"] == normalize_event(events[0])["timestamp"]
+    assert normalized[1]["timestamp"].tzinfo == timezone.utc
+    assert normalized[1]["request_id"] == "req-1"
+    assert uuid.UUID(normalized[0]["request_id"]).version == 4
+
+
+def test_normalize_raw_data_keeps_big_ints_and_non_finite_floats():
+    """Test that values orjson cannot represent survive in raw data."""
+    event = {
+        "action": "login",
+        "big": 2**70,
+        "metrics": {"ratio": float("nan"), "limit": float("inf")},
+        "seen_at": datetime(2024, 2, 9, 20, 0, tzinfo=timezone.utc),
+    }
+
+    raw_data = normalize_event(event)["raw_data"]
+
+    assert raw_data["big"] == 2**70
+    assert math.isnan(raw_data["metrics"]["ratio"])
+    assert raw_data["metrics"]["limit"] == float("inf")
+    assert raw_data["seen_at"] == "2024-02-09T20:00:00+00:00"
+
+
+def test_normalize_raw_data_with_none_values_takes_fast_path(monkeypatch):
+    """Test that None fields round-trip through orjson without the Python fallback."""
+
+    def fail(data):
+        raise AssertionError("unexpected fallback to the Python walk")
+
+    monkeypatch.setattr(normalizer, "_serialize_for_json_slow", fail)
+    event = {
+        "action": "login",
+        "user_agent": None,
+        "resource": None,
+        "raw_data": {"note": "nullable", "tags": [None, 1.5]},
+    }
+
+    assert normalize_event(event)["raw_data"] == event
@@ -1,18 +1,26 @@
 """Tests for detection rules."""
 
+import re
 from datetime import datetime, timedelta, timezone
 
 import pytest
 from app.database import Base
-from app.models import Event
+from app.models import Alert, AllowlistEntry, Event
+from app.services.detection_engine import _fingerprint_evidence, run_detections
 from app.services.rules.api_abuse import ApiAbuseRule
+from app.services.rules.base import LOGIN_ACTION
 from app.services.rules.brute_force import BruteForceRule
 from app.services.rules.impossible_travel import ImpossibleTravelRule
 from app.services.rules.password_spray import PasswordSprayRule
 from app.services.rules.privilege_escalation import PrivilegeEscalationRule
 from app.services.rules.suspicious_api_key import SuspiciousApiKeyRule
-from app.services.rules.suspicious_user_agent import SuspiciousUserAgentRule
+from app.services.rules.suspicious_user_agent import (
+    SUSPICIOUS_PATTERNS,
+    SuspiciousUserAgentRule,
+    _split_patterns,
+)
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import sessionmaker
 
 
@@ -120,6 +128,59 @@ def test_impossible_travel_rule(db_session):
     assert any(a["rule_id"] == "impossible_travel" for a in alerts)
 
 
+def test_impossible_travel_ignores_other_users_and_slow_travel(db_session):
+    """Test that logins are only paired per user and within two hours."""
+    rule = ImpossibleTravelRule()
+    now = datetime.now(timezone.utc)
+    window_start = now - timedelta(hours=3)
+
+    logins = [
+        # Different users from distant IPs: not travel
+        ("alice", "192.168.1.1", 50),
+        ("bob", "85.123.45.67", 45),
+        # Same user from distant IPs, 2.5 hours apart: plausible travel
+        ("carol", "10.0.0.1", 170),
+        ("carol", "85.123.45.67", 20),
+    ]
+    for actor, ip, minutes_ago in logins:
+        db_session.add(
+            Event(
+                timestamp=now - timedelta(minutes=minutes_ago),
+                actor=actor,
+                source_ip=ip,
+                action="user.login",
+                outcome="success",
+            )
+        )
+    db_session.commit()
+
+    assert rule.detect(db_session, window_start, now) == []
+
+
+def test_impossible_travel_handles_malformed_ips(db_session):
+    """Test that free-form source IPs with extra parts don't break detection."""
+    rule = ImpossibleTravelRule()
+    now = datetime.now(timezone.utc)
+    window_start = now - timedelta(hours=1)
+
+    for ip, minutes_ago in (("1.2.3.4.5", 45), ("6.7.8.9.10", 15)):
+        db_session.add(
+            Event(
+                timestamp=now - timedelta(minutes=minutes_ago),
+                actor="alice",
+                source_ip=ip,
+                action="user.login",
+                outcome="success",
+            )
+        )
+    db_session.commit()
+
+    alerts = rule.detect(db_session, window_start, now)
+
+    assert len(alerts) == 1
+    assert alerts[0]["evidence"]["estimated_distance_km"] == 2500
+
+
 def test_suspicious_user_agent_rule(db_session):
     """Test suspicious user-agent detection."""
     rule = SuspiciousUserAgentRule()
@@ -149,6 +210,74 @@ def test_suspicious_user_agent_rule(db_session):
     assert "curl" in alerts[0]["evidence"]["user_agent"]
 
 
+def test_suspicious_user_agent_ignores_browsers(db_session):
+    """Test that only suspicious user agents alert, regardless of case."""
+    rule = SuspiciousUserAgentRule()
+    now = datetime.now(timezone.utc)
+    window_start = now - timedelta(minutes=15)
+
+    for user_agent in ("Python-Requests/2.31.0", "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"):
+        for i in range(6):
+            db_session.add(
+                Event(
+                    timestamp=now - timedelta(minutes=i),
+                    actor="alice",
+                    source_ip="198.51.100.7",
+                    user_agent=user_agent,
+                    action="storage.object.read",
+                    outcome="success",
+                )
+            )
+
+    db_session.commit()
+
+    alerts = rule.detect(db_session, window_start, now)
+
+    assert len(alerts) == 1
+    assert alerts[0]["evidence"]["user_agent"] == "Python-Requests/2.31.0"
+    assert alerts[0]["evidence"]["pattern_matched"] == "python-requests"
+
+
+def test_suspicious_user_agent_reports_first_listed_pattern(db_session):
+    """Test that pattern_matched follows SUSPICIOUS_PATTERNS order, not match position."""
+    rule = SuspiciousUserAgentRule()
+    now = datetime.now(timezone.utc)
+    window_start = now - timedelta(minutes=15)
+
+    for user_agent in ("spider-bot", "Googlebot curl"):
+        for i in range(6):
+            db_session.add(
+                Event(
+                    timestamp=now - timedelta(minutes=i),
+                    actor="alice",
+                    source_ip="198.51.100.7",
+                    user_agent=user_agent,
+                    action="storage.object.read",
+                    outcome="success",
+                )
+            )
+
+    db_session.commit()
+
+    alerts = rule.detect(db_session, window_start, now)
+
+    matched = {a["evidence"]["user_agent"]: a["evidence"]["pattern_matched"] for a in alerts}
+    assert matched == {"spider-bot": "bot", "Googlebot curl": "curl"}
+
+
+def test_suspicious_user_agent_prefilter_covers_patterns():
+    """Test that every suspicious pattern has an SQL prefilter equivalent."""
+    exact, substrings = _split_patterns(SUSPICIOUS_PATTERNS)
+
+    assert len(exact) + len(substrings) == len(SUSPICIOUS_PATTERNS)
+    for pattern in SUSPICIOUS_PATTERNS:
+        candidates = list(exact) + list(substrings)
+        assert any(re.fullmatch(pattern, candidate) for candidate in candidates), pattern
+
+    with pytest.raises(ValueError):
+        _split_patterns(("curl", r"bot\d+"))
+
+
 def test_api_abuse_rule(db_session):
     """Test API abuse detection."""
     rule = ApiAbuseRule()
@@ -266,3 +395,107 @@ def test_suspicious_api_key_rule(db_session):
     assert alerts[0]["rule_id"] == "suspicious_api_key"
     assert "svc-backend-prod" in alerts[0]["summary"]
     assert "23:43:12" in alerts[0]["evidence"]["timestamp"]
+
+
+def test_run_detections_respects_allowlist(db_session):
+    """Test that allowlisted IPs suppress alerts during a detection run."""
+    now = datetime.now(timezone.utc)
+
+    for i in range(10):
+        db_session.add(
+            Event(
+                timestamp=now - timedelta(minutes=i),
+                actor=f"user_{i}",
+                source_ip="192.168.1.100",
+                action="user.login",
+                outcome="failure",
+            )
+        )
+
+    db_session.add(
+        AllowlistEntry(
+            entry_type="ip",
+            entry_value="192.168.1.100",
+            reason="Corporate VPN",
+            rule_id="brute_force_login",
+        )
+    )
+    db_session.commit()
+
+    result = run_detections(db_session)
+
+    # Brute force is allowlisted for this IP; password spray is not
+    assert "brute_force_login" in result["rules_executed"]
+    assert result["alerts_generated"] == 1
+
+
+def test_run_detections_deduplicates_identical_evidence(db_session):
+    """Test that re-running detections over unchanged events creates no new alerts."""
+    now = datetime.now(timezone.utc)
+
+    db_session.add(
+        Event(
+            timestamp=now - timedelta(minutes=10),
+            actor="admin_user",
+            action="iam.role.attach_policy",
+            resource="admin-role",
+        )
+    )
+    db_session.commit()
+
+    assert run_detections(db_session)["alerts_generated"] == 1
+    assert run_detections(db_session)["alerts_generated"] == 0
+
+    # A new privileged action has different evidence and still alerts
+    db_session.add(
+        Event(
+            timestamp=now - timedelta(minutes=5),
+            actor="admin_user",
+            action="iam.role.create",
+            resource="other-role",
+        )
+    )
+    db_session.commit()
+
+    assert run_detections(db_session)["alerts_generated"] == 1
+
+
+def test_fingerprint_ignores_list_order():
+    """Test that aggregated evidence lists hash the same in any order."""
+    evidence = {"source_ip": "10.0.0.1", "event_ids": [3, 1, 2], "actors": ["bob", "alice"]}
+    reordered = {"actors": ["alice", "bob"], "event_ids": [1, 2, 3], "source_ip": "10.0.0.1"}
+
+    assert _fingerprint_evidence(evidence) == _fingerprint_evidence(reordered)
+    assert _fingerprint_evidence(evidence) != _fingerprint_evidence({**evidence, "event_ids": [4]})
+
+
+def test_run_detections_deduplicates_alerts_without_fingerprint(db_session):
+    """Test that alerts stored before fingerprints existed still suppress duplicates."""
+    db_session.add(
+        Event(
+            timestamp=datetime.now(timezone.utc) - timedelta(minutes=10),
+            actor="admin_user",
+            action="iam.role.attach_policy",
+            resource="admin-role",
+        )
+    )
+    db_session.commit()
+
+    assert run_detections(db_session)["alerts_generated"] == 1
+    db_session.query(Alert).update({Alert.evidence_fingerprint: None})
+    db_session.commit()
+
+    assert run_detections(db_session)["alerts_generated"] == 0
+
+
+def test_login_partial_indexes_match_rule_filter():
+    """Test that the login partial-index predicates use the rules' login action."""
+    indexes = {index.name: index for index in Event.__table__.indexes}
+
+    for name in ("ix_events_login", "ix_events_failed_login"):
+        for dialect in (sqlite.dialect(), postgresql.dialect()):
+            predicate = indexes[name].dialect_options[dialect.name]["where"]
+            compiled = str(
+                predicate.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+            )
+            assert f"action = '{LOGIN_ACTION}'" in compiled
@@ -1,11 +1,14 @@
 """Generate realistic demo logs for SignalForge."""
 
-import json
 import random
+import time
 from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+
+import orjson
 
 # Realistic user names
-USERS = [
+USERS = (
     "alice.smith",
     "bob.jones",
     "charlie.davis",
@@ -16,25 +19,25 @@ USERS = [
     "henry.martin",
     "iris.taylor",
     "jack.brown",
-]
+)
 
 # Realistic IP addresses
-NORMAL_IPS = [
+NORMAL_IPS = (
     "192.168.1.10",
     "192.168.1.11",
     "192.168.1.12",
     "10.0.0.5",
     "10.0.0.6",
     "172.16.0.10",
-]
+)
 
-ATTACK_IPS = [
+ATTACK_IPS = (
     "203.0.113.45",  # Brute force attacker
     "198.51.100.50",  # Password spray
     "45.76.123.98",  # API abuse
-]
+)
 
-ACTIONS = [
+ACTIONS = (
     "user.login",
     "user.logout",
     "storage.object.read",
@@ -42,20 +45,37 @@ ACTIONS = [
     "storage.object.delete",
     "iam.user.list",
     "iam.role.list",
-]
+)
 
-USER_AGENTS = [
+USER_AGENTS = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
-]
+)
 
-SUSPICIOUS_USER_AGENTS = [
+SUSPICIOUS_USER_AGENTS = (
     "curl/7.68.0",
     "python-requests/2.28.1",
     "wget/1.20.3",
     "",
-]
+)
+
+
+# Output file buffer size (bytes)
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# "YYYY-MM-DDTHH:MM:" prefixes by epoch minute, shared by all generators
+_MINUTE_PREFIXES = {}
+
+
+def _format_timestamp(epoch):
+    """Format whole epoch seconds as an ISO8601 UTC string."""
+    minute, second = divmod(epoch, 60)
+    prefix = _MINUTE_PREFIXES.get(minute)
+    if prefix is None:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:", time.gmtime(minute * 60))
+        _MINUTE_PREFIXES[minute] = prefix
+    return f"{prefix}{second:02d}+00:00"
 
 
 def generate_normal_activity(count=1000, start_time=None):
@@ -63,30 +83,31 @@ def generate_normal_activity(count=1000, start_time=None):
     if start_time is None:
         start_time = datetime.now(timezone.utc) - timedelta(hours=2)
 
-    events = []
-
-    for i in range(count):
-        timestamp = start_time + timedelta(seconds=random.randint(0, 7200))
-        user = random.choice(USERS)
-        ip = random.choice(NORMAL_IPS)
-        action = random.choice(ACTIONS)
-        ua = random.choice(USER_AGENTS)
-
-        # Most actions succeed
-        outcome = "success" if random.random() > 0.05 else "failure"
-
-        event = {
-            "timestamp": timestamp.isoformat(),
-            "actor": user,
-            "source.ip": ip,
-            "user_agent": ua,
-            "action": action,
-            "resource": f"resource-{random.randint(1, 100)}",
-            "outcome": outcome,
+    base_ts = int(start_time.timestamp())
+    choices = random.choices
+    rand = random.random
+
+    # Draw each field for the whole batch in one call
+    offsets = choices(range(7201), k=count)
+    users = choices(USERS, k=count)
+    ips = choices(NORMAL_IPS, k=count)
+    actions = choices(ACTIONS, k=count)
+    uas = choices(USER_AGENTS, k=count)
+    resource_ids = choices(range(1, 101), k=count)
+
+    events = [
+        {
+            "timestamp": _format_timestamp(base_ts + offsets[i]),
+            "actor": users[i],
+            "source.ip": ips[i],
+            "user_agent": uas[i],
+            "action": actions[i],
+            "resource": f"resource-{resource_ids[i]}",
+            "outcome": "success" if rand() > 0.05 else "failure",  # Most actions succeed
             "request_id": f"req-{i:06d}",
         }
-
-        events.append(event)
+        for i in range(count)
+    ]
 
     return events
 
@@ -96,25 +117,31 @@ def generate_brute_force_attack(target_user="alice.smith", start_time=None):
     if start_time is None:
         start_time = datetime.now(timezone.utc) - timedelta(minutes=30)
 
-    events = []
+    base_ts = int(start_time.timestamp())
     attacker_ip = "203.0.113.45"
+    randint = random.randint
+
+    # Fields shared by every attempt; None marks per-event values
+    template = {
+        "timestamp": None,
+        "actor": target_user,
+        "source.ip": attacker_ip,
+        "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+        "action": "user.login",
+        "resource": "authentication_service",
+        "outcome": "failure",
+        "request_id": None,
+    }
 
     # 15 failed login attempts in 10 minutes
-    for i in range(15):
-        timestamp = start_time + timedelta(seconds=random.randint(0, 600))
-
-        event = {
-            "timestamp": timestamp.isoformat(),
-            "actor": target_user,
-            "source.ip": attacker_ip,
-            "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-            "action": "user.login",
-            "resource": "authentication_service",
-            "outcome": "failure",
+    events = [
+        {
+            **template,
+            "timestamp": _format_timestamp(base_ts + randint(0, 600)),
             "request_id": f"brute-{i:03d}",
         }
-
-        events.append(event)
+        for i in range(15)
+    ]
 
     return events
 
@@ -124,25 +151,35 @@ def generate_password_spray(start_time=None):
     if start_time is None:
         start_time = datetime.now(timezone.utc) - timedelta(minutes=25)
 
-    events = []
+    base_ts = int(start_time.timestamp())
     attacker_ip = "198.51.100.50"
+    randint = random.randint
+    rand = random.random
+
+    # Fields shared by every attempt; None marks per-event values
+    template = {
+        "timestamp": None,
+        "actor": None,
+        "source.ip": attacker_ip,
+        "user_agent": "Mozilla/5.0 (X11; Linux x86_64)",
+        "action": "user.login",
+        "resource": "authentication_service",
+        "outcome": None,
+        "request_id": None,
+    }
 
     # Attacker tries same password against 15 different users
-    for i, user in enumerate(USERS + ["test.user", "admin.user", "service.account", "guest.user", "demo.user"]):
-        timestamp = start_time + timedelta(seconds=random.randint(0, 1500))
-
-        event = {
-            "timestamp": timestamp.isoformat(),
+    targets = USERS + ("test.user", "admin.user", "service.account", "guest.user", "demo.user")
+    events = [
+        {
+            **template,
+            "timestamp": _format_timestamp(base_ts + randint(0, 1500)),
             "actor": user,
-            "source.ip": attacker_ip,
-            "user_agent": "Mozilla/5.0 (X11; Linux x86_64)",
-            "action": "user.login",
-            "resource": "authentication_service",
-            "outcome": "failure" if random.random() > 0.1 else "success",
+            "outcome": "failure" if rand() > 0.1 else "success",
             "request_id": f"spray-{i:03d}",
         }
-
-        events.append(event)
+        for i, user in enumerate(targets)
+    ]
 
     return events
 
@@ -152,11 +189,11 @@ def generate_impossible_travel(user="bob.jones", start_time=None):
     if start_time is None:
         start_time = datetime.now(timezone.utc) - timedelta(minutes=45)
 
-    events = []
+    base_ts = int(start_time.timestamp())
 
     # Login from US (192.168.1.11)
     event1 = {
-        "timestamp": start_time.isoformat(),
+        "timestamp": _format_timestamp(base_ts),
         "actor": user,
         "source.ip": "192.168.1.11",  # US /24 prefix
         "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
@@ -167,9 +204,8 @@ def generate_impossible_travel(user="bob.jones", start_time=None):
     }
 
     # Login from EU 30 minutes later (completely different /8)
-    event2_time = start_time + timedelta(minutes=30)
     event2 = {
-        "timestamp": event2_time.isoformat(),
+        "timestamp": _format_timestamp(base_ts + 30 * 60),
         "actor": user,
         "source.ip": "85.123.45.67",  # EU IP (different /8)
         "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)",
@@ -179,8 +215,7 @@ def generate_impossible_travel(user="bob.jones", start_time=None):
         "request_id": "travel-002",
     }
 
-    events.append(event1)
-    events.append(event2)
+    events = [event1, event2]
 
     return events
 
@@ -190,25 +225,32 @@ def generate_suspicious_user_agent(start_time=None):
     if start_time is None:
         start_time = datetime.now(timezone.utc) - timedelta(minutes=10)
 
-    events = []
+    base_ts = int(start_time.timestamp())
     suspicious_ip = "45.76.123.98"
+    randint = random.randint
+
+    # Fields shared by every request; None marks per-event values
+    template = {
+        "timestamp": None,
+        "actor": "api.bot.user",
+        "source.ip": suspicious_ip,
+        "user_agent": "curl/7.68.0",
+        "action": "storage.object.read",
+        "resource": None,
+        "outcome": "success",
+        "request_id": None,
+    }
 
     # 20 requests with curl user agent
-    for i in range(20):
-        timestamp = start_time + timedelta(seconds=random.randint(0, 600))
-
-        event = {
-            "timestamp": timestamp.isoformat(),
-            "actor": "api.bot.user",
-            "source.ip": suspicious_ip,
-            "user_agent": "curl/7.68.0",
-            "action": "storage.object.read",
+    events = [
+        {
+            **template,
+            "timestamp": _format_timestamp(base_ts + randint(0, 600)),
             "resource": f"data-file-{i}.json",
-            "outcome": "success",
             "request_id": f"curl-{i:03d}",
         }
-
-        events.append(event)
+        for i in range(20)
+    ]
 
     return events
 
@@ -218,25 +260,38 @@ def generate_api_abuse(start_time=None):
     if start_time is None:
         start_time = datetime.now(timezone.utc) - timedelta(minutes=3)
 
-    events = []
+    base_ts = int(start_time.timestamp())
     abuser_ip = "45.76.123.98"
+    choices = random.choices
+
+    # Fields shared by every request; None marks per-event values
+    template = {
+        "timestamp": None,
+        "actor": "scraper.account",
+        "source.ip": abuser_ip,
+        "user_agent": "python-requests/2.28.1",
+        "action": None,
+        "resource": None,
+        "outcome": "success",
+        "request_id": None,
+    }
 
     # 150 requests in 3 minutes
-    for i in range(150):
-        timestamp = start_time + timedelta(seconds=random.randint(0, 180))
-
-        event = {
-            "timestamp": timestamp.isoformat(),
-            "actor": "scraper.account",
-            "source.ip": abuser_ip,
-            "user_agent": "python-requests/2.28.1",
-            "action": random.choice(["storage.object.read", "iam.user.list", "storage.object.list"]),
-            "resource": f"resource-{random.randint(1, 50)}",
-            "outcome": "success",
+    count = 150
+    offsets = choices(range(181), k=count)
+    actions = choices(("storage.object.read", "iam.user.list", "storage.object.list"), k=count)
+    resource_ids = choices(range(1, 51), k=count)
+
+    events = [
+        {
+            **template,
+            "timestamp": _format_timestamp(base_ts + offsets[i]),
+            "action": actions[i],
+            "resource": f"resource-{resource_ids[i]}",
             "request_id": f"abuse-{i:04d}",
         }
-
-        events.append(event)
+        for i in range(count)
+    ]
 
     return events
 
@@ -246,11 +301,11 @@ def generate_privilege_escalation(start_time=None):
     if start_time is None:
         start_time = datetime.now(timezone.utc) - timedelta(minutes=20)
 
-    events = []
+    base_ts = int(start_time.timestamp())
 
     # Admin creates new role
     event1 = {
-        "timestamp": start_time.isoformat(),
+        "timestamp": _format_timestamp(base_ts),
         "actor": "admin.user",
         "source.ip": "192.168.1.10",
         "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
@@ -261,9 +316,8 @@ def generate_privilege_escalation(start_time=None):
     }
 
     # Attach admin policy
-    event2_time = start_time + timedelta(minutes=2)
     event2 = {
-        "timestamp": event2_time.isoformat(),
+        "timestamp": _format_timestamp(base_ts + 2 * 60),
         "actor": "admin.user",
         "source.ip": "192.168.1.10",
         "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
@@ -274,9 +328,8 @@ def generate_privilege_escalation(start_time=None):
     }
 
     # Promote user
-    event3_time = start_time + timedelta(minutes=5)
     event3 = {
-        "timestamp": event3_time.isoformat(),
+        "timestamp": _format_timestamp(base_ts + 5 * 60),
         "actor": "admin.user",
         "source.ip": "192.168.1.10",
         "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
@@ -286,7 +339,7 @@ def generate_privilege_escalation(start_time=None):
         "request_id": "priv-003",
     }
 
-    events.extend([event1, event2, event3])
+    events = [event1, event2, event3]
 
     return events
 
@@ -323,16 +376,16 @@ def main():
     print("  → Generating privilege escalation...")
     all_events.extend(generate_privilege_escalation(start_time=base_time + timedelta(minutes=30)))
 
-    # Sort by timestamp
-    all_events.sort(key=lambda x: x["timestamp"])
+    # Sort by timestamp (UTC ISO8601 strings order chronologically)
+    all_events.sort(key=itemgetter("timestamp"))
 
     # Write to JSONL file
     output_file = "examples/sample_logs/demo_logs.jsonl"
     print(f"\n📝 Writing {len(all_events)} events to {output_file}...")
 
-    with open(output_file, "w") as f:
-        for event in all_events:
-            f.write(json.dumps(event) + "\n")
+    # Serialize every line up front and hand the file one buffer
+    with open(output_file, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(b"".join([orjson.dumps(event, option=orjson.OPT_APPEND_NEWLINE) for event in all_events]))
 
     print(f"✅ Demo logs generated successfully!")
     print(f"\n📊 Summary:")
@@ -347,7 +400,7 @@ def main():
     print(f"     • Privilege escalation: 3 alerts")
     print(f"\n🚀 Next steps:")
     print(f"   1. Start backend: uvicorn backend.app.main:app --reload")
-    print(f"   2. Ingest logs: Use /api/v1/ingest endpoint")
+    print(f"   2. Ingest logs: Use /api/v1/ingest/ndjson endpoint")
     print(f"   3. Run detections: curl -X POST http://localhost:8000/api/v1/detections/run")
     print(f"   4. View alerts: http://localhost:3000")
 
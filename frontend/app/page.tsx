@@ -1,12 +1,12 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { Alert } from "@/types";
+import { AlertSummary } from "@/types";
 import { AlertCard } from "@/components/alert-card";
 import { Shield, AlertTriangle, Activity, TrendingUp } from "lucide-react";
 
 export default function HomePage() {
-    const [alerts, setAlerts] = useState<Alert[]>([]);
+    const [alerts, setAlerts] = useState<AlertSummary[]>([]);
     const [loading, setLoading] = useState(true);
     const [filter, setFilter] = useState("all");
     const [severityFilter, setSeverityFilter] = useState("all");
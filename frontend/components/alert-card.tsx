@@ -1,11 +1,11 @@
-import { Alert } from "@/types";
+import { AlertSummary } from "@/types";
 import { SeverityBadge } from "./severity-badge";
 import { StatusBadge } from "./status-badge";
 import { formatDistanceToNow } from "date-fns";
 import Link from "next/link";
 
 interface AlertCardProps {
-    alert: Alert;
+    alert: AlertSummary;
 }
 
 export function AlertCard({ alert }: AlertCardProps) {
@@ -12,6 +12,9 @@ export interface Alert {
     updated_at: string;
 }
 
+// Alert list endpoint omits evidence; fetch the alert by ID for details
+export type AlertSummary = Omit<Alert, "evidence">;
+
 export interface AllowlistEntry {
     id: number;
     entry_type: "ip" | "actor";
@@ -1,11 +1,15 @@
 """Script to populate test data for SignalForge dashboard."""
 
+import orjson
 import requests
 from datetime import datetime, timedelta
 import random
 
 BASE_URL = "http://localhost:8000/api/v1"
 
+# One keep-alive connection for all API calls
+session = requests.Session()
+
 # Test event data - various security scenarios
 test_events = []
 
@@ -148,7 +152,11 @@ print(f"Created {len(test_events)} test events")
 
 # Ingest events
 print("\n📥 Ingesting events...")
-response = requests.post(f"{BASE_URL}/ingest", json=test_events)
+response = session.post(
+    f"{BASE_URL}/ingest/batch",
+    data=orjson.dumps(test_events),
+    headers={"Content-Type": "application/json"},
+)
 if response.ok:
     result = response.json()
     print(f"✅ Ingested {result['ingested']} events")
@@ -160,7 +168,7 @@ else:
 
 # Run detection engine
 print("\n🔍 Running detection engine...")
-response = requests.post(f"{BASE_URL}/detections/run")
+response = session.post(f"{BASE_URL}/detections/run")
 if response.ok:
     result = response.json()
     print(f"✅ Generated {result['alerts_generated']} alerts")
@@ -172,7 +180,7 @@ else:
 
 # Fetch and display alerts
 print("\n📊 Fetching generated alerts...")
-response = requests.get(f"{BASE_URL}/alerts?limit=100")
+response = session.get(f"{BASE_URL}/alerts?limit=100")
 if response.ok:
     alerts = response.json()
     print(f"\n🚨 {len(alerts)} total alerts generated:")